@@ -1846,7 +1846,9 @@ def process_profile_arguments(args) -> EasyProfile:
 
 
 def main(argv=None):
-    multiprocessing.set_start_method("spawn")
+    # Tolerate main() having already run in this process (i.e., tests).
+    if multiprocessing.get_start_method(allow_none=True) != "spawn":
+        multiprocessing.set_start_method("spawn", force=True)
     global_init()
     initialize_logging_basic()
     # pdb.set_trace()
@@ -331,6 +331,22 @@ def is_preread_db_files() -> bool:
     return _PREREAD_DB_FILES
 
 
+# Test-only: When this environment variable is "1", SQLite connections are
+# opened with durability disabled (no fsync, in-memory journal). This is
+# unsafe for real backups and exists only so automated tests, whose
+# databases are discarded, avoid needless disk syncs.
+ATBU_TEST_SQLITE_FAST_ENV_VAR = "ATBU_TEST_SQLITE_FAST"
+_SQLITE_TEST_FAST_PRAGMAS = """
+PRAGMA synchronous=OFF;
+PRAGMA journal_mode=MEMORY;
+PRAGMA temp_store=MEMORY;
+"""
+
+
+def is_sqlite_test_fast_mode() -> bool:
+    return os.environ.get(ATBU_TEST_SQLITE_FAST_ENV_VAR) == "1"
+
+
 def read_file_to_nowhere(path):
     with open(path, mode="rb") as f:
         while f.read(0x40000):
@@ -702,7 +718,14 @@ class DbManagerSqlite3(DbInterface):
         if connection_string is None:
             raise ValueError(f"Invalid connection string: {connection_string}")
         self.connection_string = connection_string
-        self.conn = sqlite3.connect(connection_string, timeout=15.0, autocommit=False)
+        if not is_sqlite_test_fast_mode():
+            self.conn = sqlite3.connect(connection_string, timeout=15.0, autocommit=False)
+        else:
+            # The synchronous level cannot be changed inside a transaction, so
+            # apply pragmas before switching to autocommit=False.
+            self.conn = sqlite3.connect(connection_string, timeout=15.0, autocommit=True)
+            self.conn.executescript(_SQLITE_TEST_FAST_PRAGMAS)
+            self.conn.autocommit = False
 
     def close(self):
         if self.conn:
@@ -27,6 +27,7 @@ from azure.storage.blob import (
     BlobClient,
 )
 from azure.core.exceptions import (
+    HttpResponseError,
     ResourceExistsError,
     ServiceRequestError,
 )
@@ -53,6 +54,10 @@ DEFAULT_AZURE_RETRY_EXCEPTIONS = (
     ServiceRequestError,
 )
 
+# Azure Blob batch requests are limited to 256 subrequests.
+AZURE_MAX_BLOBS_PER_BATCH = 256
+
+
 class AzureStorageObjectInterface(StorageObjectInterface):
     def __init__(self, storage_object: BlobClient):
         super().__init__()
@@ -94,6 +99,19 @@ class AzureStorageContainerInterface(StorageContainerInterface):
         if blob.exists():
             blob.delete_blob()
 
+    def delete_objects(self, object_names: list[str]):
+        # Like delete_object, ignore objects that no longer exist.
+        for i in range(0, len(object_names), AZURE_MAX_BLOBS_PER_BATCH):
+            responses = self.container.delete_blobs(
+                *object_names[i : i + AZURE_MAX_BLOBS_PER_BATCH],
+                raise_on_any_failure=False,
+            )
+            for response in responses:
+                if response.status_code == 404:
+                    continue
+                if not 200 <= response.status_code < 300:
+                    raise HttpResponseError(response=response)
+
     def list_objects(self, prefix: str = None) -> list[StorageObjectInterface]:
         blob_name_list = self.container.list_blob_names(name_starts_with=prefix)
         result: list[StorageObjectInterface] = []
@@ -130,6 +148,11 @@ class AzureStorageInterface(StorageInterface):
             pass
         return max_chunk_get_size
 
+    @property
+    def delete_container_deletes_objects(self) -> bool:
+        # Azure marks the container and all of its blobs for deletion.
+        return True
+
     def _create_blob_service_client(self):
         password_type = self.driver_config.get(CONFIG_PASSWORD_TYPE)
         if password_type is None:
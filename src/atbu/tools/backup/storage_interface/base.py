@@ -82,6 +82,13 @@ class StorageContainerInterface(ABC):
     def delete_object(self, object_name: str):
         pass
 
+    def delete_objects(self, object_names: list[str]):
+        """Delete each of the named objects. Interfaces whose provider has a
+        batch delete API override this to delete many objects per request.
+        """
+        for object_name in object_names:
+            self.delete_object(object_name=object_name)
+
     @abstractmethod
     def list_objects(self, prefix: str = None) -> list[StorageObjectInterface]:
         pass
@@ -99,6 +106,13 @@ class StorageInterface(ABC):
     def download_chunk_size(self):
         return DEFAULT_CHUNK_DOWNLOAD_SIZE
 
+    @property
+    def delete_container_deletes_objects(self) -> bool:
+        """True if delete_container removes a container along with its objects,
+        False if the container must be emptied before it can be deleted.
+        """
+        return False
+
     @abstractmethod
     def get_container(self, container_name: str) -> StorageContainerInterface:
         pass
@@ -57,6 +57,8 @@ from ..config import *
 DEFAULT_RETRY_EXCEPTIONS = base.DEFAULT_RETRY_EXCEPTIONS + (InvalidResponse,)
 TWO_DAYS_IN_SECONDS = 60 * 60 * 24 * 2
 DEFAULT_RETRY_SECONDS = TWO_DAYS_IN_SECONDS
+# Google Cloud Storage batch requests are limited to 100 calls.
+GOOGLE_MAX_CALLS_PER_BATCH = 100
 
 
 class WriteableQueueIterator:
@@ -142,6 +144,19 @@ class GoogleStorageContainerInterface(StorageContainerInterface):
                 f"The object {object_name} does not exist or was not found. {exc_to_string(ex)}"
             ).with_traceback(ex.__traceback__) from ex
 
+    def delete_objects(self, object_names: list[str]):
+        for i in range(0, len(object_names), GOOGLE_MAX_CALLS_PER_BATCH):
+            batch_names = object_names[i : i + GOOGLE_MAX_CALLS_PER_BATCH]
+            try:
+                with self.container.client.batch():
+                    for object_name in batch_names:
+                        self.container.delete_blob(object_name)
+            except google.cloud.exceptions.NotFound as ex:
+                raise ObjectDoesNotExistError(
+                    f"One or more of the objects {batch_names} does not exist or was "
+                    f"not found. {exc_to_string(ex)}"
+                ).with_traceback(ex.__traceback__) from ex
+
     def list_objects(self, prefix: str = None) -> list[StorageObjectInterface]:
         blob_list = self.container.list_blobs(prefix=prefix)
         result: list[StorageObjectInterface] = []
@@ -18,6 +18,7 @@ r"""Common test helpers.
 
 from dataclasses import dataclass
 from io import SEEK_END, SEEK_SET
+import logging
 import os
 from concurrent.futures import ProcessPoolExecutor
 import glob
@@ -28,7 +29,14 @@ from pathlib import Path
 from random import randint
 import re
 import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
 from typing import Union
+import warnings
 
 # pylint: disable=unused-import,wrong-import-position
 from pytest import (
@@ -59,6 +67,11 @@ from atbu.tools.backup.storage_def_credentials import StorageDefCredentialSet
 from atbu.tools.backup.backup_constants import DatabaseFileType
 from atbu.tools.backup.backup_dao import BackupInformationDatabase, DetectedFileType
 from atbu.common.exception import InvalidStateError  # pylint: disable=unused-import
+from atbu.common.singleton import Singleton
+
+# Imported up front so atbu processes forked by run_atbu (see
+# is_atbu_inproc_enabled) start with atbu already imported.
+from atbu.tools.backup.command_line import main as atbu_main
 
 ALTERNATING_DB_TYPE = "alternating_db_type"
 
@@ -67,13 +80,29 @@ def copy2_pacifier_patch(src, dst, *args, **kwargs):
     return shutil.copy2(src=src, dst=dst, *args, **kwargs)
 
 
-def duplicate_tree(src_dir, dst_dir, no_pacifier: bool = False):
+def link_or_copy2(src, dst, *args, **kwargs):
+    try:
+        os.link(src, dst)
+    except OSError:
+        # i.e., cross-device or links not supported by the file system.
+        shutil.copy2(src, dst, *args, **kwargs)
+
+
+def duplicate_tree(
+    src_dir, dst_dir, no_pacifier: bool = False, hardlink: bool = False
+):
+    """Copy src_dir to dst_dir. If hardlink is True, files are hard linked
+    where possible, which is only suitable when neither tree's files will be
+    modified in place.
+    """
     src_dir = Path(src_dir)
     dst_dir = Path(dst_dir)
     assert src_dir.is_dir()
     assert not dst_dir.exists()
     copy_func = copy2_pacifier_patch
-    if no_pacifier:
+    if hardlink:
+        copy_func = link_or_copy2
+    elif no_pacifier:
         copy_func = shutil.copy2
     shutil.copytree(src=src_dir, dst=dst_dir, copy_function=copy_func)
 
@@ -177,16 +206,28 @@ def delete_randomly_chosen_files(
     return deleted_file_list, remaining_files_list
 
 
+_SIZE_1MB = 1024 * 1024
+# The 1MB pattern is built once and sliced (without copying) for each file.
+_TEST_DATA_1MB = memoryview(
+    bytes([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15] * (_SIZE_1MB // 16))
+)
+
+
 def create_test_data_file(file_path, size):
-    SIZE_1MB = 1024 * 1024
-    b_1mb = bytes(
-        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15] * int(SIZE_1MB / 16)
+    fd = os.open(
+        file_path,
+        os.O_CREAT | os.O_WRONLY | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+        0o666,
     )
-    with open(file_path, "wb") as f:
-        while size >= SIZE_1MB:
-            f.write(b_1mb)
-            size -= SIZE_1MB
-        f.write(b_1mb[0:size])
+    try:
+        pos = 0
+        while pos < size:
+            offset = pos % _SIZE_1MB
+            pos += os.write(
+                fd, _TEST_DATA_1MB[offset : min(_SIZE_1MB, offset + size - pos)]
+            )
+    finally:
+        os.close(fd)
 
 
 def create_test_files(
@@ -348,9 +389,15 @@ class FileInfo:
 
 
 class LocallyPersistedFileInfo(FileInfo):
-    def __init__(self, file_path, process_exec: ProcessPoolExecutor):
+    def __init__(
+        self,
+        file_path,
+        process_exec: ProcessPoolExecutor,
+        sr: os.stat_result = None,
+    ):
         super().__init__(file_path=file_path)
-        sr: os.stat_result = os.stat(self._file_path)
+        if sr is None:
+            sr = os.stat(self._file_path)
         self._modified_time = sr.st_mtime
         self._size = sr.st_size
         self._work_future = None
@@ -424,18 +471,38 @@ def get_rel_path_nc(root_path: str, path_within_root: str):
     return os.path.normcase(get_rel_path(root_path=root_path, path_within_root=path_within_root))
 
 
+def _iter_dir_files(dir_path: str):
+    """Yield os.DirEntry for each file within dir_path, recursively. Like
+    glob's "**", names starting with "." are skipped.
+    """
+    with os.scandir(dir_path) as it:
+        for de in it:
+            if de.name.startswith("."):
+                continue
+            if de.is_dir(follow_symlinks=False):
+                yield from _iter_dir_files(de.path)
+            elif de.is_file():
+                yield de
+
+
 class DirInfo:
-    def __init__(self, dir_path=None):
+    def __init__(self, dir_path=None, process_exec: ProcessPoolExecutor = None):
+        """If process_exec is specified, digests are calculated using that
+        executor, which the caller owns and may share across several DirInfo
+        instances. Otherwise, DirInfo creates and shuts down its own.
+        """
         self.dir_path = dir_path
         self.file_db = {}
         self.file_list: list[LocallyPersistedFileInfo] = []
-        self.process_exec = None
+        self.process_exec = process_exec
+        self._is_process_exec_owner = process_exec is None
+        self._merkle_root: bytes = None
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.process_exec:
+        if self.process_exec and self._is_process_exec_owner:
             try:
                 print("Waiting for ProcessPoolExecutor to shutdown...")
                 self.process_exec.shutdown(wait=True)
@@ -450,6 +517,7 @@ class DirInfo:
     def add_file_info(self, finfo: FileInfo):
         self.file_db[finfo.nc_path] = finfo
         self.file_list.append(finfo)
+        self._merkle_root = None
 
     def delete_randomly_chosen_files(
         self,
@@ -468,6 +536,7 @@ class DirInfo:
                     del self.file_list[idx]
                     fli.reset_digest()
                     break
+        self._merkle_root = None
         return deleted, remaining
 
     def gather_info(
@@ -479,21 +548,38 @@ class DirInfo:
             re_pattern_exclude = re.compile(re_pattern_exclude)
         if re_pattern_exclude is not None and not isinstance(re_pattern_exclude, re.Pattern):
             raise TypeError(f"re_pattern_include must be either a string re pattern or an re pattern.")
-        for p in glob.iglob(os.path.join(self.dir_path, "**"), recursive=True):
-            if not os.path.isfile(p):
-                continue
+        if not os.path.isdir(self.dir_path):
+            return
+        for de in _iter_dir_files(str(self.dir_path)):
+            p = de.path
             if re_pattern_exclude is not None and re_pattern_exclude.match(p):
                 continue
             if self.process_exec is None:
                 self.process_exec = ProcessPoolExecutor()
             finfo = LocallyPersistedFileInfo(
-                file_path=p, process_exec=self.process_exec
+                file_path=p, process_exec=self.process_exec, sr=de.stat()
             )
             if start_gathering_digests:
                 finfo.start_update_digest()
             self.file_db[finfo.nc_path] = finfo
             self.file_list.append(finfo)
         self.file_list.sort(key=lambda fi: fi.nc_path)
+        self._merkle_root = None
+
+    def get_merkle_root(self) -> bytes:
+        """Return a single digest over the size, modified time, and digest of
+        each file in file_list order. Two DirInfo instances with equal roots
+        match per directories_match_entirely_by_order. The root is cached
+        until file_list changes.
+        """
+        if self._merkle_root is None:
+            h = hashlib.sha256()
+            for fi in self.file_list:
+                h.update(
+                    f"{fi.size}:{fi.modified_time!r}:{fi.digest}\n".encode("utf-8")
+                )
+            self._merkle_root = h.digest()
+        return self._merkle_root
 
     def get_nc_rel_path_dict(self) -> dict[str, LocallyPersistedFileInfo]:
         if self.dir_path is None:
@@ -515,6 +601,9 @@ class DirInfo:
 def directories_match_entirely_by_order(di1: DirInfo, di2: DirInfo):
     if len(di1.file_list) != len(di2.file_list):
         return False
+    if di1.get_merkle_root() == di2.get_merkle_root():
+        return True
+    # Mismatch, compare per-file, which reports file details along the way.
     for f1, f2 in zip(di1.file_list, di2.file_list):
         if f1 != f2:
             return False
@@ -698,6 +787,171 @@ def extract_backup_summary_from_log(
     return lsi
 
 
+# When ATBU_TEST_INPROC=1 (POSIX only), run_atbu does not launch the atbu
+# executable. Instead, it forks this pytest process, which has already imported
+# atbu, and the child calls atbu's main() directly. This skips interpreter
+# startup and atbu import costs per invocation, while each invocation still
+# gets its own process, which atbu's process-global state (logging, hasher,
+# multiprocessing context, etc.) expects. The child resets the atbu globals
+# tests are known to change, but otherwise inherits this process's state,
+# including any monkeypatches, so this mode is opt-in. Forking a multi-threaded
+# process can deadlock the child, so run_atbu only forks while this process has
+# a single thread, not counting a pytest-xdist worker's execnet thread (see
+# _get_thread_count). Otherwise, it warns and runs the atbu executable as usual,
+# without the speedup.
+ATBU_TEST_INPROC_ENV_VAR = "ATBU_TEST_INPROC"
+_IS_ATBU_PREIMPORTED = False
+
+
+def is_atbu_inproc_enabled() -> bool:
+    return hasattr(os, "fork") and os.environ.get(ATBU_TEST_INPROC_ENV_VAR) == "1"
+
+
+def _get_thread_count() -> int:
+    try:
+        # Also counts threads not started through threading (and threads that
+        # are still exiting), as does Python's own warning about fork().
+        count = len(os.listdir("/proc/self/task"))
+    except OSError:
+        # threading does not see execnet's thread, so nothing to discount.
+        return threading.active_count()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        # A pytest-xdist worker always runs execnet's channel receiver thread
+        # next to the main thread. The forked child never uses the channel and
+        # leaves through os._exit, so that thread does not make forking unsafe.
+        count -= 1
+    return count
+
+
+def _can_fork_atbu() -> bool:
+    if not is_atbu_inproc_enabled():
+        return False
+    thread_count = _get_thread_count()
+    if thread_count != 1:
+        warnings.warn(
+            f"Not forking atbu, the test process has {thread_count} threads. "
+            f"Running the atbu executable instead."
+        )
+        return False
+    return True
+
+
+def preimport_atbu_for_inproc():
+    """Import modules atbu otherwise imports lazily, and resolve the keyring
+    backend, so children forked by run_atbu do not each repeat that work.
+    Only the first call does anything.
+    """
+    # pylint: disable=import-outside-toplevel
+    global _IS_ATBU_PREIMPORTED
+    if _IS_ATBU_PREIMPORTED:
+        return
+    import keyring
+    from atbu.tools.backup.storage_interface import (
+        azure,
+        filesystem,
+        google,
+        libcloud,
+    )
+
+    keyring.get_keyring()
+    _IS_ATBU_PREIMPORTED = True
+
+
+def _atbu_inproc_child(cmdargs: tuple[str], stdin_fd, stdout_fd, stderr_fd):
+    """Runs in the forked child, never returns."""
+    exit_code = 1
+    try:
+        os.dup2(stdin_fd, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+        sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = open(2, "w", encoding="utf-8", closefd=False)
+        # Start with logging as it would be in a new process, without
+        # pytest's handlers.
+        logging.root.handlers.clear()
+        logging.root.setLevel(logging.WARNING)
+        # Likewise, start without singletons (i.e., GlobalHasherDefinitions)
+        # and with AtbuConfig's defaults.
+        Singleton._instances.clear()  # pylint: disable=protected-access
+        AtbuConfig.always_migrate = False
+        exit_code = atbu_main(list(cmdargs))
+        if exit_code is None:
+            exit_code = 0
+    except SystemExit as ex:
+        exit_code = ex.code if isinstance(ex.code, int) else 1
+    except BaseException:  # pylint: disable=broad-except
+        # Same as an unhandled exception in an atbu process.
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)  # pylint: disable=protected-access
+
+
+def _run_atbu_inproc(
+    pytester: Pytester,
+    cmdargs: tuple[str],
+    stdin: bytes = None,
+    timeout=None,
+) -> RunResult:
+    """Run atbu's main() in a child forked from this process, returning a
+    RunResult shaped like the one from pytester.run.
+    """
+    # The import work is done once, before the first fork.
+    preimport_atbu_for_inproc()
+    print("running (forked):", "atbu", *cmdargs)
+    print("     in:", Path.cwd())
+    with (
+        tempfile.TemporaryFile() as f_in,
+        tempfile.TemporaryFile() as f_out,
+        tempfile.TemporaryFile() as f_err,
+    ):
+        if stdin:
+            f_in.write(stdin)
+            f_in.seek(0)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        start_time = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            _atbu_inproc_child(
+                cmdargs=cmdargs,
+                stdin_fd=f_in.fileno(),
+                stdout_fd=f_out.fileno(),
+                stderr_fd=f_err.fileno(),
+            )
+        while True:
+            wait_pid, status = os.waitpid(pid, os.WNOHANG)
+            if wait_pid != 0:
+                break
+            if timeout is not None and time.perf_counter() - start_time > timeout:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                raise pytester.TimeoutExpired(
+                    f"{timeout} second timeout expired running: {cmdargs}"
+                )
+            time.sleep(0.01)
+        duration = time.perf_counter() - start_time
+        ret = os.waitstatus_to_exitcode(status)
+        f_out.seek(0)
+        f_err.seek(0)
+        out = f_out.read().decode("utf-8", errors="replace").splitlines()
+        err = f_err.read().decode("utf-8", errors="replace").splitlines()
+
+    for line in out:
+        print(line)
+    for line in err:
+        print(line, file=sys.stderr)
+    try:
+        ret = ExitCode(ret)
+    except ValueError:
+        pass
+    return RunResult(ret, out, err, duration)
+
+
 def run_atbu(
     pytester: Pytester,
     tmp_path: Path,
@@ -706,23 +960,33 @@ def run_atbu(
     timeout=120,
     log_base_name: str = None,
 ):
-    if platform.system() == "Windows":
-        atbu_path = shutil.which("atbu.exe")
-    else:
-        atbu_path = shutil.which("atbu")
-    assert atbu_path is not None
     if log_base_name is None:
         log_base_name = "main"
     log_file = tmp_path / f"atbu-{log_base_name}.log"
-    rr = pytester.run(
-        atbu_path,
+    cmdargs = (
         "--automated-testing",
-        *args,
+        *[os.fspath(a) for a in args],
         "--loglevel",
         "DEBUG",
         "--logfile",
         str(log_file),
         "-v",
+    )
+    if _can_fork_atbu():
+        return _run_atbu_inproc(
+            pytester=pytester,
+            cmdargs=cmdargs,
+            stdin=stdin,
+            timeout=timeout,
+        )
+    if platform.system() == "Windows":
+        atbu_path = shutil.which("atbu.exe")
+    else:
+        atbu_path = shutil.which("atbu")
+    assert atbu_path is not None
+    rr = pytester.run(
+        atbu_path,
+        *cmdargs,
         timeout=timeout,
         stdin=stdin,
     )
@@ -1911,21 +2175,18 @@ def validate_backup_restore_history(
     cur_alternating_db_type = DatabaseFileType.SQLITE
 
     source_directory = Path(source_directory)
-    test_backup_restore_dir_info: list[SourceDirInfo] = [
-        SourceDirInfo(
-            total_files=expected_total_files,
-            dir_path=source_directory,
-            restore_path=source_directory.with_name(
-                name=source_directory.name + "-Restore"
-            ),
-        )
-    ]
+    source_parent_dir = source_directory.parent
+    source_base_name = source_directory.name
+    test_backup_restore_dir_info: list[SourceDirInfo] = [None] * max(1, max_history)
+    test_backup_restore_dir_info[0] = SourceDirInfo(
+        total_files=expected_total_files,
+        dir_path=source_directory,
+        restore_path=source_parent_dir / f"{source_base_name}-Restore",
+    )
     last_br_info = test_backup_restore_dir_info[0]
     for i in range(1, max_history):
-        new_dir_path = source_directory.with_name(name=source_directory.name + f"-{i}")
-        new_restore_path = source_directory.with_name(
-            name=source_directory.name + f"-{i}-Restore"
-        )
+        new_dir_path = source_parent_dir / f"{source_base_name}-{i}"
+        new_restore_path = source_parent_dir / f"{source_base_name}-{i}-Restore"
         duplicate_tree(
             src_dir=last_br_info.dir_path,
             dst_dir=new_dir_path,
@@ -1940,7 +2201,7 @@ def validate_backup_restore_history(
             dir_path=new_dir_path,
             restore_path=new_restore_path,
         )
-        test_backup_restore_dir_info.append(last_br_info)
+        test_backup_restore_dir_info[i] = last_br_info
 
     for i, br_info in enumerate(test_backup_restore_dir_info):
 
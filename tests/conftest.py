@@ -13,4 +13,41 @@
 # limitations under the License.
 r"""ATBU conftest.py
 """
+import os
+
 pytest_plugins = "pytester"
+
+# Test databases are thrown away, so skip SQLite fsync/journal I/O. This is
+# inherited by atbu subprocesses started by the tests. Tests that must cover
+# the production SQLite connect path unset it (i.e.,
+# test_backup_restore_sqlite_db_durable).
+# See atbu.tools.backup.db_api.ATBU_TEST_SQLITE_FAST_ENV_VAR.
+os.environ.setdefault("ATBU_TEST_SQLITE_FAST", "1")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "google_storage: test uses the Google Cloud Storage SDK."
+    )
+    # Registered by pytest-xdist when installed, declared here for runs without it.
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run tests of the same group on one worker."
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if not any(item.get_closest_marker("google_storage") for item in items):
+        return
+    # Importing google.api_core.exceptions acts as a
+    # workaround for an issue where, if it is used
+    # by a factory used by a test, and loaded dynamically
+    # the first test will succeed, the others failing.
+    # This only happens with pytest and seems to relate
+    # to stale state in protobuf message.cc in relation to
+    # how the environment is managed when pytester is used,
+    # where id(_message.Message) changes at Python level, but
+    # not in the message.cc related pyd (dll).
+    # The import is deferred to here so runs that select no
+    # Google tests do not pay for loading the Google SDK.
+    # pylint: disable=import-outside-toplevel,unused-import
+    import google.api_core.exceptions
@@ -30,11 +30,13 @@ from pytest import (
     Config,
     RunResult,
     ExitCode,
+    MonkeyPatch,
 )
 import pytest
 
 from atbu.tools.backup.config import AtbuConfig
 from atbu.tools.backup.backup_constants import DatabaseFileType
+from atbu.tools.backup.db_api import ATBU_TEST_SQLITE_FAST_ENV_VAR
 
 from .common_helpers import (
     ALTERNATING_DB_TYPE,
@@ -55,7 +57,12 @@ from .common_helpers import (
 
 LOGGER = logging.getLogger(__name__)
 
+# Each test uses its own tmp_path, so the module can be run in parallel with
+# pytest-xdist (i.e., "pytest -n auto"). The backup name is still suffixed with
+# the xdist worker id, if any, so names never collide between workers.
 ATBU_TEST_BACKUP_NAME = "AtbuTestBackup-5b497bb3-c9ef-48a9-af7b-2327fc17fb65"
+if os.environ.get("PYTEST_XDIST_WORKER"):
+    ATBU_TEST_BACKUP_NAME += f"-{os.environ['PYTEST_XDIST_WORKER']}"
 
 # import pdb; pdb.set_trace()
 # import pdb; pdb.set_trace()
@@ -97,6 +104,38 @@ def test_backup_restore(
     db_type,
     tmp_path: Path,
     pytester: Pytester,
+):
+    backup_restore_basic(
+        compression_type=compression_type,
+        db_type=db_type,
+        tmp_path=tmp_path,
+        pytester=pytester,
+    )
+
+
+def test_backup_restore_sqlite_db_durable(
+    tmp_path: Path,
+    pytester: Pytester,
+    monkeypatch: MonkeyPatch,
+):
+    """conftest.py turns on ATBU_TEST_SQLITE_FAST for the session. Run one SQLite
+    backup/restore without it, so atbu's production SQLite connect path (default
+    journaling, autocommit=False from the start) is still exercised end to end.
+    """
+    monkeypatch.delenv(ATBU_TEST_SQLITE_FAST_ENV_VAR, raising=False)
+    backup_restore_basic(
+        compression_type="normal",
+        db_type=DatabaseFileType.SQLITE.value,
+        tmp_path=tmp_path,
+        pytester=pytester,
+    )
+
+
+def backup_restore_basic(
+    compression_type,
+    db_type,
+    tmp_path: Path,
+    pytester: Pytester,
 ):
     establish_random_seed(tmp_path)  # bytes([0,1,2,3])
 
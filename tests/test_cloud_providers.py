@@ -18,22 +18,17 @@ r"""Cloud storage basic E2E.
 # pylint: disable=unused-variable
 # pylint: disable=unused-import
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 from pathlib import Path
 import logging
 import keyring
 import pytest
 
-# Importing google.api_core.exceptions acts as a
-# workaround for an issue where, if it is used
-# by a factory used by a test, and loaded dynamically
-# the first test will succeed, the others failing.
-# This only happens with pytest and seems to relate
-# to stale state in protobuf message.cc in relation to
-# how the environment is managed when pytester is used,
-# where id(_message.Message) changes at Python level, but
-# not in the message.cc related pyd (dll).
-import google.api_core.exceptions
+# See conftest.py pytest_collection_modifyitems regarding the
+# google.api_core.exceptions import workaround, which is only
+# applied when tests marked google_storage are selected.
 
 LOGGER = logging.getLogger(__name__)
 
@@ -58,9 +53,14 @@ from atbu.tools.backup.constants import (
     CONFIG_VALUE_NAME_CONTAINER,
     CREDS_SUBCMD_CREATE_STORAGE_DEF,
 )
+from atbu.common.exception import ContainerAlreadyExistsError
 from atbu.tools.backup.config import AtbuConfig
 
-from atbu.tools.backup.storage_interface.base import StorageInterfaceFactory
+from atbu.tools.backup.storage_interface.base import (
+    StorageContainerInterface,
+    StorageInterface,
+    StorageInterfaceFactory,
+)
 
 # pylint: disable=unused-import
 from .secrets import (
@@ -94,8 +94,34 @@ from .common_helpers import (
 
 from atbu.tools.backup.backup_constants import DatabaseFileType
 
+# Each provider's tests are grouped onto one pytest-xdist worker (see the
+# xdist_group marks below), so providers can run in parallel with
+# "pytest -n 4 --dist=loadgroup". Names are suffixed with the xdist worker id,
+# if any, so they never collide between workers.
 TEST_BACKUP_NAME = "atbu-backup-5b497bb3-c9ef-48a9-af7b-2327fc17fb65"
 TEST_CONTAINER_BASE_NAME = "atbu-bucket"
+if os.environ.get("PYTEST_XDIST_WORKER"):
+    TEST_BACKUP_NAME += f"-{os.environ['PYTEST_XDIST_WORKER']}"
+    TEST_CONTAINER_BASE_NAME += f"-{os.environ['PYTEST_XDIST_WORKER']}"
+
+# Set ATBU_TEST_REUSE_BUCKET=<suffix> to have tests use, and only empty, the
+# container named TEST_CONTAINER_BASE_NAME-<suffix>, creating it if needed,
+# rather than creating and deleting a uniquely named container per test.
+TEST_REUSE_BUCKET_ENV_VAR = "ATBU_TEST_REUSE_BUCKET"
+TEST_REUSE_BUCKET_SUFFIX = os.environ.get(TEST_REUSE_BUCKET_ENV_VAR)
+
+# Number of containers emptied/deleted concurrently during teardown, tunable per
+# CI runner with ATBU_TEST_DELETE_CONCURRENCY.
+TEST_DELETE_CONCURRENCY_ENV_VAR = "ATBU_TEST_DELETE_CONCURRENCY"
+DELETE_CONTAINERS_MAX_WORKERS = int(
+    os.environ.get(TEST_DELETE_CONCURRENCY_ENV_VAR, 10)
+)
+
+# Timeout for each atbu backup/restore run against a cloud provider. Hung runs
+# wait this long before failing, so CI can lower it with ATBU_TEST_CLOUD_TIMEOUT
+# (seconds) once typical provider latency is known.
+TEST_CLOUD_TIMEOUT_ENV_VAR = "ATBU_TEST_CLOUD_TIMEOUT"
+TEST_CLOUD_TIMEOUT_SECONDS = int(os.environ.get(TEST_CLOUD_TIMEOUT_ENV_VAR, 60 * 5))
 
 # import pdb; pdb.set_trace()
 # import pdb; pdb.set_trace()
@@ -109,29 +135,30 @@ def teardown_module(module):  # pylint: disable=unused-argument
     pass
 
 
-def get_storage_factory(storage_def_name: str) -> StorageInterfaceFactory:
-    return StorageInterfaceFactory.create_factory_from_storage_def_name(
-        storage_def_name=storage_def_name
-    )
-
-
-def get_storage_def_dict(storage_def_name: str) -> dict:
-    cfg: AtbuConfig
-    cfg, _, storage_def_dict = AtbuConfig.access_cloud_storage_config(
-        storage_def_name=storage_def_name,
-        must_exist=True,
-        create_if_not_exist=False,
-    )
-    return storage_def_dict
-
-
 def get_all_storage_def_names() -> list[str]:
     return AtbuConfig.get_user_storage_def_names()
 
 
-def get_container_name(storage_def_name: str) -> str:
-    storage_def_dict = get_storage_def_dict(storage_def_name=storage_def_name)
-    return storage_def_dict[CONFIG_VALUE_NAME_CONTAINER]
+def get_test_container_name_arg() -> str:
+    if TEST_REUSE_BUCKET_SUFFIX:
+        return f"{TEST_CONTAINER_BASE_NAME}-{TEST_REUSE_BUCKET_SUFFIX}"
+    return f"{TEST_CONTAINER_BASE_NAME}*"
+
+
+@lru_cache(maxsize=32)
+def _load_storage_def(storage_def_name: str) -> tuple[str, StorageInterface]:
+    """Return the container name and a storage interface for storage_def_name,
+    reading the storage definition's configuration and connecting to the provider
+    once for the teardown helpers below. Call _load_storage_def.cache_clear() when
+    storage definitions are created or deleted.
+    """
+    factory = StorageInterfaceFactory.create_factory_from_storage_def_name(
+        storage_def_name=storage_def_name
+    )
+    return (
+        factory.storage_def_dict[CONFIG_VALUE_NAME_CONTAINER],
+        factory.create_storage_interface(),
+    )
 
 
 def create_storage_definition_json(
@@ -178,7 +205,7 @@ def create_storage_definition_json(
             TEST_BACKUP_NAME,
             interface,
             provider,
-            f"{TEST_CONTAINER_BASE_NAME}*",
+            get_test_container_name_arg(),
             driver_arg,
             stdin=stdin_resp_enable_enc_pwd_not_req,
             log_base_name=f"{CREDS_SUBCMD_CREATE_STORAGE_DEF}-json",
@@ -193,11 +220,12 @@ def create_storage_definition_json(
             TEST_BACKUP_NAME,
             interface,
             provider,
-            f"{TEST_CONTAINER_BASE_NAME}*",
+            get_test_container_name_arg(),
             stdin=stdin_resp_enable_enc_pwd_not_req,
             log_base_name=f"{CREDS_SUBCMD_CREATE_STORAGE_DEF}-json",
         )
     assert rr.ret == ExitCode.OK
+    _load_storage_def.cache_clear()
 
     storage_def_name_atbu_cfg_path_list = (
         extract_storage_definition_and_config_file_path(rr.outlines)
@@ -217,37 +245,62 @@ def create_storage_definition_json(
         CONFIG_VALUE_NAME_CONTAINER
     ]
 
+    if TEST_REUSE_BUCKET_SUFFIX:
+        create_or_empty_reused_container(storage_def_name=storage_def_name)
+
     return storage_def_name, atbu_cfg_path, container_name
 
 
-def delete_all_objects(storage_def_name: str):
-    factory = get_storage_factory(storage_def_name=storage_def_name)
+def create_or_empty_reused_container(storage_def_name: str):
+    container_name, interface = _load_storage_def(storage_def_name=storage_def_name)
+    try:
+        interface.create_container(container_name=container_name)
+    except ContainerAlreadyExistsError:
+        delete_all_objects(
+            container=interface.get_container(container_name=container_name)
+        )
+
 
-    interface = factory.create_storage_interface()
-    container_name = get_container_name(storage_def_name=storage_def_name)
-    container = interface.get_container(container_name=container_name)
+def delete_all_objects(container: StorageContainerInterface):
     list_objs = container.list_objects()
-    for obj in list_objs:
-        container.delete_object(object_name=obj.name)
+    container.delete_objects(object_names=[obj.name for obj in list_objs])
 
 
 def delete_container(storage_def_name: str):
-    factory = get_storage_factory(storage_def_name=storage_def_name)
-    interface = factory.create_storage_interface()
-    container_name = get_container_name(storage_def_name=storage_def_name)
+    container_name, interface = _load_storage_def(storage_def_name=storage_def_name)
 
-    delete_all_objects(storage_def_name=storage_def_name)
+    if TEST_REUSE_BUCKET_SUFFIX or not interface.delete_container_deletes_objects:
+        delete_all_objects(
+            container=interface.get_container(container_name=container_name)
+        )
+
+    if TEST_REUSE_BUCKET_SUFFIX:
+        return
 
     interface.delete_container(container_name=container_name)
 
 
+def _delete_container_log_failure(storage_def_name: str):
+    try:
+        delete_container(storage_def_name=storage_def_name)
+    except Exception as ex:
+        LOGGER.error(f"failed to delete container {storage_def_name}. {ex}")
+
+
 def delete_all_containers():
     all_storage_def_names = get_all_storage_def_names()
-    for name in all_storage_def_names:
-        try:
-            delete_container(storage_def_name=name)
-        except Exception as ex:
-            LOGGER.error(f"failed to delete container {name}. {ex}")
+    if not all_storage_def_names:
+        return
+    # Containers are independent of each other, empty/delete them concurrently.
+    # Keep the pool small to stay clear of provider request rate limits.
+    with ThreadPoolExecutor(
+        max_workers=max(
+            1, min(DELETE_CONTAINERS_MAX_WORKERS, len(all_storage_def_names))
+        ),
+        thread_name_prefix="delete_container",
+    ) as executor:
+        list(executor.map(_delete_container_log_failure, all_storage_def_names))
+    _load_storage_def.cache_clear()
 
 
 def delete_storage_definition_json(
@@ -270,6 +323,7 @@ def delete_storage_definition_json(
         log_base_name="delete-storage-def",
     )
     assert rr.ret == ExitCode.OK
+    _load_storage_def.cache_clear()
 
     kr_pwd_after_del = keyring.get_password(
         service_name=TEST_BACKUP_NAME, username=CONFIG_KEYRING_USERNAME_STORAGE_PASSWORD
@@ -292,21 +346,20 @@ def cleanup_keyring(pytester: Pytester):
     except Exception:
         pass
 
-    try:
-        keyring.delete_password(
-            service_name=TEST_BACKUP_NAME,
-            username=CONFIG_KEYRING_USERNAME_STORAGE_PASSWORD,
-        )
-    except Exception:
-        pass
-
-    try:
-        keyring.delete_password(
-            service_name=TEST_BACKUP_NAME,
-            username=CONFIG_KEYRING_USERNAME_BACKUP_ENCRYPTION,
-        )
-    except Exception:
-        pass
+    # Resolve the backend once for both deletions. Each username is deleted on
+    # its own so a missing entry does not skip the other. Entries are usually
+    # already gone (delete_storage_definition_json removes them), so check first
+    # rather than paying for a failed delete.
+    kr = keyring.get_keyring()
+    for username in (
+        CONFIG_KEYRING_USERNAME_STORAGE_PASSWORD,
+        CONFIG_KEYRING_USERNAME_BACKUP_ENCRYPTION,
+    ):
+        try:
+            if kr.get_password(TEST_BACKUP_NAME, username) is not None:
+                kr.delete_password(TEST_BACKUP_NAME, username)
+        except Exception:
+            pass
 
 
 backup_restore_parameters = [
@@ -318,10 +371,14 @@ backup_restore_parameters = [
         GOOGLE_STORAGE_SERVICE_ACCOUNT_JSON_PATH,
         CONFIG_PASSWORD_KIND_FILENAME,
         id="google",
-        marks=pytest.mark.skipif(
-            GOOGLE_STORAGE_SERVICE_ACCOUNT_CLIENT_EMAIL == "skip",
-            reason="secrets not available.",
-        ),
+        marks=[
+            pytest.mark.google_storage,
+            pytest.mark.xdist_group(name="google"),
+            pytest.mark.skipif(
+                GOOGLE_STORAGE_SERVICE_ACCOUNT_CLIENT_EMAIL == "skip",
+                reason="secrets not available.",
+            ),
+        ],
     ),
     pytest.param(
         "azure",
@@ -331,9 +388,13 @@ backup_restore_parameters = [
         AZSDK_AZURE_BLOB_STORAGE_SECRET,
         CONFIG_PASSWORD_KIND_ACTUAL,
         id="azsdk_azure",
-        marks=pytest.mark.skipif(
-            AZSDK_AZURE_BLOB_STORAGE_USERKEY == "skip", reason="secrets not available."
-        ),
+        marks=[
+            pytest.mark.xdist_group(name="azsdk_azure"),
+            pytest.mark.skipif(
+                AZSDK_AZURE_BLOB_STORAGE_USERKEY == "skip",
+                reason="secrets not available.",
+            ),
+        ],
     ),
     pytest.param(
         "libcloud",
@@ -343,9 +404,13 @@ backup_restore_parameters = [
         LIBCLOUD_AZURE_BLOB_STORAGE_SECRET,
         CONFIG_PASSWORD_KIND_ACTUAL,
         id="libcloud_azure",
-        marks=pytest.mark.skipif(
-            LIBCLOUD_AZURE_BLOB_STORAGE_USERKEY == "skip", reason="secrets not available."
-        ),
+        marks=[
+            pytest.mark.xdist_group(name="libcloud_azure"),
+            pytest.mark.skipif(
+                LIBCLOUD_AZURE_BLOB_STORAGE_USERKEY == "skip",
+                reason="secrets not available.",
+            ),
+        ],
     ),
     pytest.param(
         "libcloud",
@@ -355,13 +420,58 @@ backup_restore_parameters = [
         AWS_STORAGE_SECRET,
         CONFIG_PASSWORD_KIND_ACTUAL,
         id="aws",
-        marks=pytest.mark.skipif(
-            AWS_STORAGE_ACCESSKEY == "skip", reason="secrets not available."
-        ),
+        marks=[
+            pytest.mark.xdist_group(name="aws"),
+            pytest.mark.skipif(
+                AWS_STORAGE_ACCESSKEY == "skip",
+                reason="secrets not available.",
+            ),
+        ],
     ),
 ]
 
 
+def create_storage_def_and_source_directory(
+    interface,
+    provider,
+    project_id,
+    userkey,
+    secret,
+    tmp_path: Path,
+    pytester: Pytester,
+    create_test_data_directory_func,
+    use_secrets_prompt: bool = False,
+) -> tuple[str, str, Path, int]:
+    """Create the test storage definition and a source directory populated by
+    create_test_data_directory_func, the common setup for the backup tests below.
+    Returns (storage_def_name, atbu_cfg_path, source_directory, total_files).
+    """
+    storage_def_name, atbu_cfg_path, _ = create_storage_definition_json(
+        interface,
+        provider,
+        project_id,
+        userkey,
+        secret,
+        tmp_path=tmp_path,
+        pytester=pytester,
+        use_secrets_prompt=use_secrets_prompt,
+    )
+    assert storage_def_name == TEST_BACKUP_NAME
+    assert os.path.isfile(atbu_cfg_path)
+
+    establish_random_seed(tmp_path)
+
+    source_directory = tmp_path / "SourceDataDir"
+
+    _, files_created = create_test_data_directory_func(
+        path_to_dir=source_directory,
+    )
+    total_files = len(files_created)
+    assert total_files > 0
+
+    return storage_def_name, atbu_cfg_path, source_directory, total_files
+
+
 @pytest.mark.parametrize(
     "interface,provider,project_id,userkey,secret,secret_type",
     backup_restore_parameters,
@@ -409,7 +519,6 @@ def test_create_storage_definition_json(
     assert password_type_from_cfg == secret_type
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
 
 @pytest.mark.parametrize(
     "interface,provider,project_id,userkey,secret,secret_type",
@@ -459,7 +568,6 @@ def test_create_storage_definition_json__secrets_prompt(
     assert password_type_from_cfg == secret_type
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
 
 
 @pytest.mark.parametrize(
@@ -476,7 +584,12 @@ def test_backup_restore(
     tmp_path: Path,
     pytester: Pytester,
 ):
-    storage_def_name, atbu_cfg_path, container_name = create_storage_definition_json(
+    (
+        storage_def_name,
+        atbu_cfg_path,
+        source_directory,
+        total_files,
+    ) = create_storage_def_and_source_directory(
         interface,
         provider,
         project_id,
@@ -484,38 +597,24 @@ def test_backup_restore(
         secret,
         tmp_path=tmp_path,
         pytester=pytester,
+        create_test_data_directory_func=create_test_data_directory_basic,
     )
-    assert storage_def_name == TEST_BACKUP_NAME
-    assert os.path.isfile(atbu_cfg_path)
-
-    establish_random_seed(tmp_path)
-
-    source_directory = tmp_path / "SourceDataDir"
-
-    _, files_created = create_test_data_directory_basic(
-        path_to_dir=source_directory,
-    )
-    total_files = len(files_created)
-    assert total_files > 0
-
-    storage_specifier = f"storage:{TEST_BACKUP_NAME}"
 
     validate_backup_restore(
         pytester=pytester,
         tmp_path=tmp_path,
         source_directory=source_directory,
         initial_expected_total_files=total_files,
-        storage_specifier=storage_specifier,
+        storage_specifier=f"storage:{storage_def_name}",
         compression_type="normal",
         db_type=None,
         backup_base_name=None,
-        backup_timeout=60 * 5,
-        restore_timeout=60 * 5,
+        backup_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
+        restore_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
         initial_backup_stdin=None,
     )
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
 
 
 @pytest.mark.parametrize(
@@ -532,7 +631,12 @@ def test_backup_restore__secrets_prompt(
     tmp_path: Path,
     pytester: Pytester,
 ):
-    storage_def_name, atbu_cfg_path, container_name = create_storage_definition_json(
+    (
+        storage_def_name,
+        atbu_cfg_path,
+        source_directory,
+        total_files,
+    ) = create_storage_def_and_source_directory(
         interface,
         provider,
         project_id,
@@ -540,39 +644,25 @@ def test_backup_restore__secrets_prompt(
         secret,
         tmp_path=tmp_path,
         pytester=pytester,
+        create_test_data_directory_func=create_test_data_directory_minimal_vary,
         use_secrets_prompt=True,
     )
-    assert storage_def_name == TEST_BACKUP_NAME
-    assert os.path.isfile(atbu_cfg_path)
-
-    establish_random_seed(tmp_path)
-
-    source_directory = tmp_path / "SourceDataDir"
-
-    _, files_created = create_test_data_directory_minimal_vary(
-        path_to_dir=source_directory,
-    )
-    total_files = len(files_created)
-    assert total_files > 0
-
-    storage_specifier = f"storage:{TEST_BACKUP_NAME}"
 
     validate_backup_restore(
         pytester=pytester,
         tmp_path=tmp_path,
         source_directory=source_directory,
         initial_expected_total_files=total_files,
-        storage_specifier=storage_specifier,
+        storage_specifier=f"storage:{storage_def_name}",
         compression_type="normal",
         db_type=None,
         backup_base_name=None,
-        backup_timeout=60 * 5,
-        restore_timeout=60 * 5,
+        backup_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
+        restore_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
         initial_backup_stdin=None,
     )
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
 
 
 @pytest.mark.parametrize(
@@ -589,7 +679,12 @@ def test_backup_restore_history(
     tmp_path: Path,
     pytester: Pytester,
 ):
-    storage_def_name, atbu_cfg_path, container_name = create_storage_definition_json(
+    (
+        storage_def_name,
+        atbu_cfg_path,
+        source_directory,
+        total_files,
+    ) = create_storage_def_and_source_directory(
         interface,
         provider,
         project_id,
@@ -597,21 +692,8 @@ def test_backup_restore_history(
         secret,
         tmp_path=tmp_path,
         pytester=pytester,
+        create_test_data_directory_func=create_test_data_directory_minimal_vary,
     )
-    assert storage_def_name == TEST_BACKUP_NAME
-    assert os.path.isfile(atbu_cfg_path)
-
-    establish_random_seed(tmp_path)
-
-    source_directory = tmp_path / "SourceDataDir"
-
-    _, files_created = create_test_data_directory_minimal_vary(
-        path_to_dir=source_directory,
-    )
-    total_files = len(files_created)
-    assert total_files > 0
-
-    storage_specifier = f"storage:{TEST_BACKUP_NAME}"
 
     validate_backup_restore_history(
         pytester=pytester,
@@ -619,18 +701,16 @@ def test_backup_restore_history(
         max_history=3,
         source_directory=source_directory,
         expected_total_files=total_files,
-        storage_specifier=storage_specifier,
+        storage_specifier=f"storage:{storage_def_name}",
         compression_type="normal",
         db_type=None,
         backup_base_name=None,
-        backup_timeout=60 * 5,
-        restore_timeout=60 * 5,
+        backup_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
+        restore_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
         initial_backup_stdin=None,
     )
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
-
 
 
 @pytest.mark.parametrize(
@@ -647,7 +727,12 @@ def test_backup_dryrun(
     tmp_path: Path,
     pytester: Pytester,
 ):
-    storage_def_name, atbu_cfg_path, container_name = create_storage_definition_json(
+    (
+        storage_def_name,
+        atbu_cfg_path,
+        source_directory,
+        total_files,
+    ) = create_storage_def_and_source_directory(
         interface,
         provider,
         project_id,
@@ -655,35 +740,21 @@ def test_backup_dryrun(
         secret,
         tmp_path=tmp_path,
         pytester=pytester,
+        create_test_data_directory_func=create_test_data_directory_minimal_vary,
     )
-    assert storage_def_name == TEST_BACKUP_NAME
-    assert os.path.isfile(atbu_cfg_path)
-
-    establish_random_seed(tmp_path)
-
-    source_directory = tmp_path / "SourceDataDir"
-
-    _, files_created = create_test_data_directory_minimal_vary(
-        path_to_dir=source_directory,
-    )
-    total_files = len(files_created)
-    assert total_files > 0
-
-    storage_specifier = f"storage:{TEST_BACKUP_NAME}"
 
     validate_backup_dryrun(
         pytester=pytester,
         tmp_path=tmp_path,
         source_directory=source_directory,
         total_original_files=total_files,
-        storage_specifier=storage_specifier,
-        backup_timeout=60 * 5,
-        restore_timeout=60 * 5,
+        storage_specifier=f"storage:{storage_def_name}",
+        backup_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
+        restore_timeout=TEST_CLOUD_TIMEOUT_SECONDS,
         initial_backup_stdin=None,
     )
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
 
 
 @pytest.mark.parametrize(
@@ -700,7 +771,12 @@ def test_credential_export_import(
     tmp_path: Path,
     pytester: Pytester,
 ):
-    storage_def_name, atbu_cfg_path, container_name = create_storage_definition_json(
+    (
+        storage_def_name,
+        atbu_cfg_path,
+        source_directory,
+        total_files,
+    ) = create_storage_def_and_source_directory(
         interface,
         provider,
         project_id,
@@ -708,19 +784,8 @@ def test_credential_export_import(
         secret,
         tmp_path=tmp_path,
         pytester=pytester,
+        create_test_data_directory_func=create_test_data_directory_minimal,
     )
-    assert storage_def_name == TEST_BACKUP_NAME
-    assert os.path.isfile(atbu_cfg_path)
-
-    establish_random_seed(tmp_path)
-
-    source_directory = tmp_path / "SourceDataDir"
-
-    _, files_created = create_test_data_directory_minimal(
-        path_to_dir=source_directory,
-    )
-    total_files = len(files_created)
-    assert total_files > 0
 
     #
     # Backup file. Restoring this, or not, is basis for other
@@ -733,7 +798,7 @@ def test_credential_export_import(
         "--full",
         source_directory,
         f"storage:{storage_def_name}",
-        timeout=60 * 5,
+        timeout=TEST_CLOUD_TIMEOUT_SECONDS,
         log_base_name="backup",
     )
     assert rr.ret == ExitCode.OK
@@ -749,7 +814,6 @@ def test_credential_export_import(
     )
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
 
 
 @pytest.mark.parametrize(
@@ -766,7 +830,12 @@ def test_credential_and_backup_info_recovery(
     tmp_path: Path,
     pytester: Pytester,
 ):
-    storage_def_name, atbu_cfg_path, container_name = create_storage_definition_json(
+    (
+        storage_def_name,
+        atbu_cfg_path,
+        source_directory,
+        total_files,
+    ) = create_storage_def_and_source_directory(
         interface,
         provider,
         project_id,
@@ -774,19 +843,8 @@ def test_credential_and_backup_info_recovery(
         secret,
         tmp_path=tmp_path,
         pytester=pytester,
+        create_test_data_directory_func=create_test_data_directory_minimal,
     )
-    assert storage_def_name == TEST_BACKUP_NAME
-    assert os.path.isfile(atbu_cfg_path)
-
-    establish_random_seed(tmp_path)
-
-    source_directory = tmp_path / "SourceDataDir"
-
-    _, files_created = create_test_data_directory_minimal(
-        path_to_dir=source_directory,
-    )
-    total_files = len(files_created)
-    assert total_files > 0
 
     #
     # Backup file. Restoring this, or not, is basis for other
@@ -799,7 +857,7 @@ def test_credential_and_backup_info_recovery(
         "--full",
         source_directory,
         f"storage:{storage_def_name}",
-        timeout=60 * 5,
+        timeout=TEST_CLOUD_TIMEOUT_SECONDS,
         log_base_name="backup",
     )
     assert rr.ret == ExitCode.OK
@@ -815,4 +873,3 @@ def test_credential_and_backup_info_recovery(
     )
 
     delete_storage_definition_json(tmp_path=tmp_path, pytester=pytester)
-    pass  # pylint: disable=unnecessary-pass
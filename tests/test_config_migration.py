@@ -67,34 +67,59 @@ from atbu.tools.backup.storage_def_credentials import StorageDefCredentialSet
 
 Version001_storage_def_name1 = "my-cloud-backup-53fcc53f-a5a5-4939-a88a-e8ad1c95fb0e"
 
-Version001_config = {
-    "name": "ATBU Configuration",
-    "version": "0.01",
-    "general": {"backup-info-dir": "C:\\Users\\TestUser\\.atbu\\atbu-backup-info"},
-    "storage-definitions": {
-        Version001_storage_def_name1: {
-            "interface": "someinterface",
-            "provider": "some_storage_provider",
-            "container": "my-cloud-backup-xyz",
-            "driver": {
-                "key": "some-storage-key",
-                "project": "some-storage-project",
-                "secret": "keyring",
-            },
-            "keyring-mapping": {
-                "driver-secret": {
-                    "service": Version001_storage_def_name1,
-                    "username": "ATBU-storage-password",
+
+def make_version001_config(storage_def_name: str) -> dict:
+    return {
+        "name": "ATBU Configuration",
+        "version": "0.01",
+        "general": {"backup-info-dir": "C:\\Users\\TestUser\\.atbu\\atbu-backup-info"},
+        "storage-definitions": {
+            storage_def_name: {
+                "interface": "someinterface",
+                "provider": "some_storage_provider",
+                "container": "my-cloud-backup-xyz",
+                "driver": {
+                    "key": "some-storage-key",
+                    "project": "some-storage-project",
+                    "secret": "keyring",
                 },
-                "encryption-key": {
-                    "service": Version001_storage_def_name1,
-                    "username": "ATBU-backup-enc-key",
+                "keyring-mapping": {
+                    "driver-secret": {
+                        "service": storage_def_name,
+                        "username": "ATBU-storage-password",
+                    },
+                    "encryption-key": {
+                        "service": storage_def_name,
+                        "username": "ATBU-backup-enc-key",
+                    },
                 },
-            },
-            "encryption": {"key": "keyring"},
-        }
-    },
-}
+                "encryption": {"key": "keyring"},
+            }
+        },
+    }
+
+
+CRED_PASSWORD_STR = "test-cred-password$"
+
+
+@pytest.fixture(scope="session")
+def password_protected_enc_cred_material() -> dict[str, CredentialByteArray]:
+    """Create a password-protected backup encryption key once per session.
+    Protecting a key runs PBKDF2 at its full work factor, so the parametrized
+    cases share this material rather than each deriving the key encryption key
+    again to protect and then re-validate their own key.
+    """
+    cred_enc = CredentialAesKey()
+    cred_enc.create_key()
+    cred_enc.set(password=CredentialByteArray(CRED_PASSWORD_STR.encode("utf-8")))
+    cred_enc.encrypt_key()
+    return {
+        "salt": CredentialByteArray(cred_enc.salt),
+        "iv": CredentialByteArray(cred_enc.iv),
+        "password_auth_hash": CredentialByteArray(cred_enc.password_auth_hash),
+        "encrypted_key": CredentialByteArray(cred_enc.encrypted_key),
+        "the_key": CredentialByteArray(cred_enc.the_key),
+    }
 
 
 @pytest.mark.parametrize(
@@ -133,11 +158,11 @@ def test_migrate_001_to_003(
     is_backup_encryption: bool,
     is_storage_secret: bool,
     is_password_protected: bool,
+    request: FixtureRequest,
 ):
     if is_password_protected:
 
-        cred_password_str = "test-cred-password$"
-        cred_password = CredentialByteArray(cred_password_str.encode("utf-8"))
+        cred_password = CredentialByteArray(CRED_PASSWORD_STR.encode("utf-8"))
 
         def mock_prompt_password_return(
             prompt,
@@ -152,11 +177,20 @@ def test_migrate_001_to_003(
             mock_prompt_password_return,
         )
 
-    test_atbu_cfg_001 = copy.deepcopy(Version001_config)
+    # Keyring entries are keyed by storage definition name and, with an OS
+    # keyring, shared by all processes. A name unique to each case lets the
+    # cases run concurrently (i.e., pytest-xdist) without colliding.
+    storage_def_name1 = (
+        f"{Version001_storage_def_name1}"
+        f"-{int(is_backup_encryption)}"
+        f"{int(is_storage_secret)}"
+        f"{int(is_password_protected)}"
+    )
+    test_atbu_cfg_001 = make_version001_config(storage_def_name=storage_def_name1)
     storage_defs_section = test_atbu_cfg_001[
         Version_001.CONFIG_SECTION_STORAGE_DEFINITIONS
     ]
-    storage_def_section = storage_defs_section[Version001_storage_def_name1]
+    storage_def_section = storage_defs_section[storage_def_name1]
     storage_def_mapping_section = storage_def_section[
         Version_001.CONFIG_SECTION_KEYRING_MAPPING
     ]
@@ -174,11 +208,11 @@ def test_migrate_001_to_003(
     if len(storage_def_section[Version_001.CONFIG_SECTION_KEYRING_MAPPING]) == 0:
         del storage_def_section[Version_001.CONFIG_SECTION_KEYRING_MAPPING]
 
-    AtbuConfig.get_user_default_config_dir().mkdir(parents=True, exist_ok=True)
     user_default_config_path = AtbuConfig.get_user_default_config_file_path()
+    user_default_config_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(user_default_config_path, "w", encoding="utf-8") as config_file:
-        config_file.write(json.dumps(test_atbu_cfg_001, indent=4))
+        json.dump(test_atbu_cfg_001, config_file)
 
     cred_enc = None
     storage_secret = None
@@ -189,25 +223,31 @@ def test_migrate_001_to_003(
         cred_count += 1
 
     if is_backup_encryption:
-        cred_enc = CredentialAesKey()
-        cred_enc.create_key()
         if is_password_protected:
-            cred_enc.set(password=CredentialByteArray(cred_password))
-            cred_enc.encrypt_key()
+            # Copies, since the credential may zero its arrays when cleared.
+            cred_enc = CredentialAesKey(
+                **{
+                    name: CredentialByteArray(value)
+                    for name, value in request.getfixturevalue(
+                        "password_protected_enc_cred_material"
+                    ).items()
+                }
+            )
+        else:
+            cred_enc = CredentialAesKey()
+            cred_enc.create_key()
         set_password_to_keyring_001(
-            service_name=Version001_storage_def_name1,
+            service_name=storage_def_name1,
             username=Version_001.CONFIG_KEYRING_USERNAME_BACKUP_ENCRYPTION,
             password_type=Version_001.CONFIG_PASSWORD_TYPE_ACTUAL,
             password_bytes=cred_enc.get_material_as_bytes(),
             password_is_base64=False,
         )
-        if is_password_protected:
-            cred_enc.decrypt_key()  # prepare for validation below.
 
     if is_storage_secret:
         storage_secret = CredentialByteArray("storage-secret-abc123$".encode("utf-8"))
         set_password_to_keyring_001(
-            service_name=Version001_storage_def_name1,
+            service_name=storage_def_name1,
             username=Version_001.CONFIG_KEYRING_USERNAME_STORAGE_PASSWORD,
             password_type=Version_001.CONFIG_PASSWORD_TYPE_ACTUAL,
             password_bytes=storage_secret,
@@ -216,11 +256,11 @@ def test_migrate_001_to_003(
 
     storage_def_dict = copy.deepcopy(
         test_atbu_cfg_001[Version_001.CONFIG_SECTION_STORAGE_DEFINITIONS][
-            Version001_storage_def_name1
+            storage_def_name1
         ]
     )
     cred_set = StorageDefCredentialSet(
-        storage_def_name=Version001_storage_def_name1,
+        storage_def_name=storage_def_name1,
         storage_def_dict=storage_def_dict,
     )
     try:
@@ -241,13 +281,13 @@ def test_migrate_001_to_003(
     AtbuConfig.always_migrate = True
 
     # Perform the same as the old way: atbu_cfg = AtbuConfig.access_default_config()
-    atbu_cfg = AtbuConfig(path=AtbuConfig.get_user_default_config_file_path())
+    atbu_cfg = AtbuConfig(path=user_default_config_path)
     # pylint: disable=protected-access
     atbu_cfg._check_upgrade_default_config()
 
     atbu_cfg2: AtbuConfig
     atbu_cfg2, storage_def_name2, storage_def_dict2 = AtbuConfig.access_cloud_storage_config(
-        storage_def_name=Version001_storage_def_name1,
+        storage_def_name=storage_def_name1,
         must_exist=True,
     )
 
@@ -255,47 +295,35 @@ def test_migrate_001_to_003(
     assert storage_def_name2 is not None
     assert storage_def_dict2 is not None
     assert atbu_cfg2.version == ATBU_CONFIG_FILE_VERSION_STRING_CURRENT
-    assert storage_def_name2 == Version001_storage_def_name1
+    assert storage_def_name2 == storage_def_name1
     assert isinstance(storage_def_dict2[CONFIG_VALUE_NAME_STORAGE_DEF_UNIQUE_ID], str)
     assert (len(storage_def_dict2[CONFIG_VALUE_NAME_STORAGE_DEF_UNIQUE_ID]) == len(str(uuid4())))
-    assert (
-        storage_def_section[CONFIG_VALUE_NAME_INTERFACE_TYPE]
-        == storage_def_dict2[CONFIG_VALUE_NAME_INTERFACE_TYPE]
-    )
-    assert (
-        storage_def_section[CONFIG_VALUE_NAME_PROVIDER]
-        == storage_def_dict2[CONFIG_VALUE_NAME_PROVIDER]
-    )
-    assert (
-        storage_def_section[CONFIG_VALUE_NAME_CONTAINER]
-        == storage_def_dict2[CONFIG_VALUE_NAME_CONTAINER]
-    )
+    for value_name in (
+        CONFIG_VALUE_NAME_INTERFACE_TYPE,
+        CONFIG_VALUE_NAME_PROVIDER,
+        CONFIG_VALUE_NAME_CONTAINER,
+    ):
+        assert storage_def_section[value_name] == storage_def_dict2[value_name]
     driver_section = storage_def_section.get(CONFIG_SECTION_DRIVER)
     driver_section2 = storage_def_dict2.get(CONFIG_SECTION_DRIVER)
     if is_storage_secret:
         assert isinstance(driver_section, dict)
         assert isinstance(driver_section2, dict)
-        assert (
-            driver_section[CONFIG_VALUE_NAME_DRIVER_STORAGE_KEY]
-            == driver_section2[CONFIG_VALUE_NAME_DRIVER_STORAGE_KEY]
-        )
-        assert (
-            driver_section[CONFIG_VALUE_NAME_DRIVER_STORAGE_PROJECT]
-            == driver_section2[CONFIG_VALUE_NAME_DRIVER_STORAGE_PROJECT]
-        )
-        assert (
-            driver_section[CONFIG_VALUE_NAME_DRIVER_STORAGE_SECRET]
-            == driver_section2[CONFIG_VALUE_NAME_DRIVER_STORAGE_SECRET]
-        )
+        for value_name in (
+            CONFIG_VALUE_NAME_DRIVER_STORAGE_KEY,
+            CONFIG_VALUE_NAME_DRIVER_STORAGE_PROJECT,
+            CONFIG_VALUE_NAME_DRIVER_STORAGE_SECRET,
+        ):
+            assert driver_section[value_name] == driver_section2[value_name]
         assert driver_section2[CONFIG_PASSWORD_TYPE] == CONFIG_PASSWORD_KIND_ACTUAL
     else:
         assert driver_section is None
         assert driver_section2 is None
 
     cred_set = StorageDefCredentialSet(
-        storage_def_name=Version001_storage_def_name1,
+        storage_def_name=storage_def_name1,
         storage_def_dict=atbu_cfg2.get_storage_def_dict(
-            storage_def_name=Version001_storage_def_name1,
+            storage_def_name=storage_def_name1,
             must_exist=True,
         ),
     )
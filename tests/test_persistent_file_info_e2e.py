@@ -20,14 +20,13 @@ r"""E2E tests for persistent file information.
 
 from asyncio import InvalidStateError
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from io import SEEK_END, SEEK_SET
+import mmap
 import os
 from pathlib import Path
-from random import randint
 import random
 import re
-import string
 from typing import Any
 import logging
 
@@ -69,7 +68,6 @@ from .common_helpers import (
     directories_match_entirely_by_order,
     duplicate_tree,
     establish_random_seed,
-    get_rel_path,
     get_rel_path_nc,
     run_atbu,
 )
@@ -82,6 +80,7 @@ SIZE_BINARY_CONTENTS_3 = SIZE_1MB + 2
 SIZE_BINARY_CONTENTS_4 = SIZE_2MB
 SIZE_BINARY_CONTENTS_5 = SIZE_2MB + 1
 BYTES_16 = b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
+BYTES_1MB = BYTES_16 * (SIZE_1MB // len(BYTES_16))
 TEXT_FILE_CONTENTS_1 = "What a wonderful day!"
 TEXT_FILE_CONTENTS_2 = "What a wonderful day!!"
 TEXT_FILE_CONTENTS_4 = "What a wonderful day!!!"
@@ -90,6 +89,15 @@ TEXT_FILE_CONTENTS_5 = "What a wonderful evening!"
 STATE_ORIGINAL = "original"
 STATE_DELETED = "deleted"
 STATE_BITROT = "bitrot"
+# Matches the .atbu and .atbudb files that update-digests/arrange generate.
+RE_PAT_EXCLUDE_ATBU = re.compile(
+    pattern=(
+        rf".*("
+        rf"{re.escape(ATBU_PERSISTENT_INFO_EXTENSION)}|"
+        rf"{re.escape(ATBU_PERSISTENT_INFO_DB_EXTENSION)})$"
+    ),
+    flags=0 if is_platform_path_case_sensitive() else re.IGNORECASE
+)
 
 
 def setup_module(module):  # pylint: disable=unused-argument
@@ -186,12 +194,16 @@ UpToDateFileInfo = namedtuple("UpToDateFileInfo", "path, hash_name, hash")
 AddedFileInfoDetailed = namedtuple(
     "AddedFileInfo", "path, config_path, size_in_bytes, last_modified, hash_name, hash"
 )
+# Each regex is anchored at the start of a line (re.MULTILINE) and, other than
+# an explicit \n, cannot match across lines (\s is [^\S\n], [^=] is [^=\n]).
+# See extract_info_from_output.
 output_extraction_definitions: list[OutputExtractionDefinition] = [
     OutputExtractionDefinition(
         name="UpdatedFileInfo",
         # Example: Updated info: path=<path_name_here> sha256=<digest_here>
         regex=re.compile(
-            f".*The.*file info was updated: path=([^\\s]+)\\s+([^=]+)=([0-9a-fA-F]+).*"
+            f"^.*The.*file info was updated: path=([^\\s]+)[^\\S\\n]+([^=\\n]+)=([0-9a-fA-F]+).*",
+            flags=re.MULTILINE,
         ),
         cls=UpdatedFileInfo,
     ),
@@ -199,7 +211,8 @@ output_extraction_definitions: list[OutputExtractionDefinition] = [
         name="AddedFileInfo",
         # Example: Updated info: path=<path_name_here> sha256=<digest_here>
         regex=re.compile(
-            f".*The.*file info was added: path=([^\\s]+)\\s+([^=]+)=([0-9a-fA-F]+).*"
+            f"^.*The.*file info was added: path=([^\\s]+)[^\\S\\n]+([^=\\n]+)=([0-9a-fA-F]+).*",
+            flags=re.MULTILINE,
         ),
         cls=AddedFileInfo,
     ),
@@ -207,7 +220,8 @@ output_extraction_definitions: list[OutputExtractionDefinition] = [
         name="UpToDateFileInfo",
         # Example: Updated info: path=<path_name_here> sha256=<digest_here>
         regex=re.compile(
-            f".*The.*file info was up to date: path=([^\\s]+)\\s+([^=]+)=([0-9a-fA-F]+).*"
+            f"^.*The.*file info was up to date: path=([^\\s]+)[^\\S\\n]+([^=\\n]+)=([0-9a-fA-F]+).*",
+            flags=re.MULTILINE,
         ),
         cls=UpToDateFileInfo,
     ),
@@ -215,8 +229,9 @@ output_extraction_definitions: list[OutputExtractionDefinition] = [
         name="AddedFileInfoDetailed",
         # Example: Adding file information to results: path=<path_name_here>\nconfig_path=<path_name_here>\ninfo_current...\n  sizeinbytes=1048576\n  lastmodified=2022/03/28-00:17:40\n  sha256=<digest_here>\ninfo_history...\n  INFO.0000:\n    sizeinbytes=1048576\n    lastmodified=2022/03/28-00:17:40\n    sha256=<digest_here>'
         regex=re.compile(
-            f".*The.*file info was added:"
-            f".*path=([^\\s]+).*\n.*config_path=([^\\s]+).*\n.*info_current.*\n.*sizeinbytes=(\\d+).*\n.*lastmodified=([^\\s]+).*\n.*\\s([^\\s=]+)=([0-9a-zA-Z]+).*\n.*info_history.*"
+            f"^.*The.*file info was added:"
+            f".*path=([^\\s]+).*\n.*config_path=([^\\s]+).*\n.*info_current.*\n.*sizeinbytes=(\\d+).*\n.*lastmodified=([^\\s]+).*\n.*[^\\S\\n]([^\\s=]+)=([0-9a-zA-Z]+).*\n.*info_history.*",
+            flags=re.MULTILINE,
         ),
         cls=AddedFileInfoDetailed,
     ),
@@ -231,18 +246,20 @@ def get_persist_type_option(persist_types: list[str]) -> str:
     return persist_type_prefix
 
 
-@dataclass
+@dataclass(slots=True)
 class SpecificLayoutEntry:
     parent: object
     dir_path: Path
     file_path: Path
     config_file_path: Path
     file_name: Path
-    content_type: string
+    content_type: str
     content: Any
-    state: string
-    old_digest: string
+    state: str
+    old_digest: str
     validated: bool = False
+    nc_file_path: str = None
+    nc_config_file_path: str = None
 
 
 class SpecificLayout:
@@ -259,24 +276,26 @@ class SpecificLayout:
         self.dbc: FileInformationDatabaseCollection = None
         self.dict_ncpath_to_fi: dict[str, FileInformationPersistent] = None
         self._entries: list[SpecificLayoutEntry] = []
+        root_path_str = str(root_path)
         for le in layout:
-            dir_path: Path = root_path / le.directory
-            file_path: Path = dir_path / le.file_name
-            config_file_path: Path = file_path.with_suffix(
-                file_path.suffix + ATBU_PERSISTENT_INFO_EXTENSION
-            )
+            # Build paths as strings, creating each Path only once.
+            dir_path = os.path.normpath(os.path.join(root_path_str, le.directory))
+            file_path = os.path.join(dir_path, le.file_name)
+            config_file_path = file_path + ATBU_PERSISTENT_INFO_EXTENSION
             self._entries.append(
                 SpecificLayoutEntry(
                     parent=self,
-                    dir_path=dir_path,
-                    file_path=file_path,
-                    config_file_path=config_file_path,
+                    dir_path=Path(dir_path),
+                    file_path=Path(file_path),
+                    config_file_path=Path(config_file_path),
                     file_name=le.file_name,
                     content_type=le.content_type,
                     content=le.content,
                     state=STATE_ORIGINAL,
                     old_digest=None,
                     validated=False,
+                    nc_file_path=os.path.normcase(file_path),
+                    nc_config_file_path=os.path.normcase(config_file_path),
                 )
             )
 
@@ -291,14 +310,16 @@ class SpecificLayout:
         return self.dbc
 
     def reload_db(self):
+        # The db is rewritten wholesale by an external update-digests run, so
+        # there is nothing to refresh incrementally. Drop the loaded copy and
+        # let the next lookup load the current one, skipping the load
+        # entirely if another rescan happens before any lookup.
         self.dbc = None
-        self.load_db()
+        self.dict_ncpath_to_fi = None
 
     def get_file_info_from_db_cfg(self, sle: SpecificLayoutEntry):
         self.load_db()
-        nc_file_path = os.path.normcase(str(sle.file_path))
-        fi = self.dict_ncpath_to_fi.get(nc_file_path)
-        return fi
+        return self.dict_ncpath_to_fi.get(sle.nc_file_path)
 
     def get_file_info(self, sle: SpecificLayoutEntry, is_read: bool = False):
         if ATBU_PERSIST_TYPE_PER_FILE in self.persist_types:
@@ -311,11 +332,29 @@ class SpecificLayout:
                 fi = FileInformationPersistent(path=str(sle.file_path))
         return fi
 
-    def is_config_present(self, sle: SpecificLayoutEntry):
+    def get_present_nc_paths(self) -> set[str]:
+        # One scandir per layout directory rather than a stat per file.
+        present_nc_paths = set()
+        for dir_path in {sle.dir_path for sle in self._entries}:
+            try:
+                with os.scandir(dir_path) as it:
+                    for de in it:
+                        present_nc_paths.add(os.path.normcase(de.path))
+            except FileNotFoundError:
+                pass
+        return present_nc_paths
+
+    def is_config_present(
+        self,
+        sle: SpecificLayoutEntry,
+        present_nc_paths: set[str] = None,
+    ):
         for pt in self.persist_types:
             if pt == ATBU_PERSIST_TYPE_PER_DIR:
                 return self.get_file_info_from_db_cfg(sle=sle) is not None
             elif pt == ATBU_PERSIST_TYPE_PER_FILE:
+                if present_nc_paths is not None:
+                    return sle.nc_config_file_path in present_nc_paths
                 return sle.config_file_path.exists()
             else:
                 raise InvalidStateError(f"Expected value persist type but got {pt}")
@@ -357,18 +396,10 @@ def reset_specific_layout_validated_state(layout: SpecificLayout):
 
 def create_binary_file(file_path: Path, size):
     LOGGER.debug(f"Creating binary file: path={file_path} size={size}")
+    full_mb_count, remainder = divmod(size, SIZE_1MB)
+    contents = BYTES_1MB * full_mb_count + BYTES_1MB[:remainder]
     with open(file_path, "wb") as f:
-        b = BYTES_16 * int(SIZE_1MB / len(BYTES_16))  # 1MB
-        while size >= SIZE_1MB:
-            f.write(b)
-            size -= SIZE_1MB
-        while size >= len(BYTES_16):
-            f.write(BYTES_16)
-            size -= len(BYTES_16)
-        while size > 0:
-            size_to_write = min(size, len(BYTES_16))
-            f.write(BYTES_16[:size_to_write])
-            size -= size_to_write
+        f.write(contents)
 
 
 def create_text_file(file_path: Path, contents):
@@ -390,22 +421,38 @@ def create_test_dir_layout(root_path: Path, specific_layout: SpecificLayout):
             create_text_file(sle.file_path, sle.content)
 
 
+def read_persisted_primary_digest(path: str) -> str:
+    fip = FileInformationPersistent(path=path)
+    assert fip.info_data_file_exists()
+    fip.read_info_data_file()
+    return fip.primary_digest
+
+
+def move_file(src_path: str, dest_path: str):
+    # Unlike os.renames, do not try to prune the source's parent directories.
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    os.rename(src_path, dest_path)
+
+
 def extract_info_from_output(output_lines: list[str]):
-    info = []
-    for output in output_lines:
-        for oed in output_extraction_definitions:
-            mo = oed.regex.match(output)
-            if mo is not None:
-                info.append(oed.cls(*mo.groups()))
-    return info
+    # Scan all output with one finditer per regex, then restore output order
+    # by match position, the order in which verification expects to see it.
+    # Matches spanning lines are skipped, so this finds exactly what matching
+    # each line on its own would find.
+    output = "\n".join(output_lines)
+    positioned_info = []
+    for oed in output_extraction_definitions:
+        for mo in oed.regex.finditer(output):
+            if "\n" in mo.group(0):
+                continue
+            positioned_info.append((mo.start(), oed.cls(*mo.groups())))
+    positioned_info.sort(key=lambda pi: pi[0])
+    return [pi[1] for pi in positioned_info]
 
 
 def is_digest_in_output(digest: str, output_lines: list[str]):
-    digest = digest.lower()
-    for output in output_lines:
-        if output.lower().find(digest) != -1:
-            return True
-    return False
+    # Digests never span lines, so search all output with one lower()/find.
+    return digest.lower() in "\n".join(output_lines).lower()
 
 
 def verify_specific_layout_validated(specific_layout: SpecificLayout):
@@ -413,39 +460,45 @@ def verify_specific_layout_validated(specific_layout: SpecificLayout):
         assert sle.validated
 
 
+def index_output_info_by_path(output_info_list: list) -> dict[str, list]:
+    # Keyed by normcased path. Output order is preserved within each list.
+    output_info_by_path: dict[str, list] = {}
+    for o in output_info_list:
+        if isinstance(o, (UpdatedFileInfo, AddedFileInfo, UpToDateFileInfo)):
+            output_info_by_path.setdefault(os.path.normcase(o.path), []).append(o)
+    return output_info_by_path
+
+
 def verify_output_file_hash_info(
-    output_info_list: list,
-    file_path: Path,
+    output_info_by_path: dict[str, list],
+    nc_file_path: str,
     state: str,
     digest_from_config_file: str,
     hashing_algo_name: str,
 ):
-    for o in output_info_list:
+    for o in output_info_by_path.get(nc_file_path, []):
         if isinstance(o, UpdatedFileInfo):
             # if isinstance(oi, UpdatedFileInfo):
             ufh: UpdatedFileInfo = o
-            if Path(ufh.path) == file_path:
-                assert state != STATE_DELETED
-                assert ufh.hash_name == hashing_algo_name
-                assert ufh.hash == digest_from_config_file
-                return True
+            assert state != STATE_DELETED
+            assert ufh.hash_name == hashing_algo_name
+            assert ufh.hash == digest_from_config_file
+            return True
         elif isinstance(o, AddedFileInfo):
             afi: AddedFileInfo = o
-            if Path(afi.path) == file_path:
-                assert state != STATE_DELETED
-                assert afi.hash_name == hashing_algo_name
-                assert afi.hash == digest_from_config_file
-                return True
+            assert state != STATE_DELETED
+            assert afi.hash_name == hashing_algo_name
+            assert afi.hash == digest_from_config_file
+            return True
         elif isinstance(o, UpToDateFileInfo):
             afi: UpToDateFileInfo = o
-            if Path(afi.path) == file_path:
-                assert state != STATE_DELETED
-                assert afi.hash_name == hashing_algo_name
-                assert afi.hash == digest_from_config_file
-                return True
+            assert state != STATE_DELETED
+            assert afi.hash_name == hashing_algo_name
+            assert afi.hash == digest_from_config_file
+            return True
     if state != STATE_DELETED:
         fail(
-            f"File name and hash not found in test output and not expected to be {state}: path={file_path}"
+            f"File name and hash not found in test output and not expected to be {state}: path={nc_file_path}"
         )
 
 
@@ -453,14 +506,16 @@ def verify_expected_vs_actual(specific_layout: SpecificLayout, info: list):
     primary_hashing_algo_name = (
         GlobalHasherDefinitions().get_primary_hashing_algo_name()
     )
+    info_by_path = index_output_info_by_path(output_info_list=info)
+    present_nc_paths = specific_layout.get_present_nc_paths()
     for sle in specific_layout:
         sl: SpecificLayout = sle.parent
         fidf = None
         digest = None
         calculated_hash = None
         if sle.state == STATE_ORIGINAL:
-            assert sle.file_path.exists()
-            assert sl.is_config_present(sle)
+            assert sle.nc_file_path in present_nc_paths
+            assert sl.is_config_present(sle, present_nc_paths)
             fidf = sl.get_file_info(sle=sle, is_read=True)
             assert str(sle.file_path) == fidf.path
             if sl.is_per_file_config:
@@ -469,8 +524,8 @@ def verify_expected_vs_actual(specific_layout: SpecificLayout, info: list):
                 assert sle.config_file_path == Path(fidf.info_data_file_path)
             digest = fidf.get_current_digest()
             verify_output_file_hash_info(
-                output_info_list=info,
-                file_path=sle.file_path,
+                output_info_by_path=info_by_path,
+                nc_file_path=sle.nc_file_path,
                 state=sle.state,
                 digest_from_config_file=digest,
                 hashing_algo_name=primary_hashing_algo_name,
@@ -479,27 +534,27 @@ def verify_expected_vs_actual(specific_layout: SpecificLayout, info: list):
             assert digest == calculated_hash
             sle.validated = True
         elif sle.state == STATE_DELETED:
-            assert not sle.file_path.exists()
-            assert not sl.is_config_present(sle)
+            assert sle.nc_file_path not in present_nc_paths
+            assert not sl.is_config_present(sle, present_nc_paths)
             fidf = sl.get_file_info(sle=sle)
             with raises(FileNotFoundError):
                 fidf.read_info_data_file()
             verify_output_file_hash_info(
-                output_info_list=info,
-                file_path=sle.file_path,
+                output_info_by_path=info_by_path,
+                nc_file_path=sle.nc_file_path,
                 state=sle.state,
                 digest_from_config_file="",
                 hashing_algo_name=primary_hashing_algo_name,
             )
             sle.validated = True
         elif sle.state == STATE_BITROT:
-            assert sle.file_path.exists()
-            assert sl.is_config_present(sle)
+            assert sle.nc_file_path in present_nc_paths
+            assert sl.is_config_present(sle, present_nc_paths)
             fidf = sl.get_file_info(sle=sle, is_read=True)
             digest = fidf.get_current_digest()
             verify_output_file_hash_info(
-                output_info_list=info,
-                file_path=sle.file_path,
+                output_info_by_path=info_by_path,
+                nc_file_path=sle.nc_file_path,
                 state=sle.state,
                 digest_from_config_file=digest,
                 hashing_algo_name=primary_hashing_algo_name,
@@ -555,8 +610,22 @@ def create_layout1(
         layout=basic_dir_layout1,
         persist_types=persist_types,
     )
-    create_test_dir_layout(root_path=locA_path, specific_layout=locA_specific_layout)
-    create_test_dir_layout(root_path=locB_path, specific_layout=locB_specific_layout)
+    # The two locations are independent, create them concurrently.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(
+                create_test_dir_layout,
+                root_path=locA_path,
+                specific_layout=locA_specific_layout,
+            ),
+            executor.submit(
+                create_test_dir_layout,
+                root_path=locB_path,
+                specific_layout=locB_specific_layout,
+            ),
+        ]
+        for future in futures:
+            future.result()
     return locA_path, locA_specific_layout, locB_path, locB_specific_layout
 
 
@@ -1044,18 +1113,14 @@ def test_diff_bit_rot(
     sle.old_digest = locB_specific_layout.get_file_info(sle).primary_digest
     sr: os.stat_result = os.stat(sle.file_path)
     with open(sle.file_path, "r+b") as the_file:
-        the_file.seek(0, SEEK_END)
-        file_size = the_file.tell()
-        mod_pos = int(file_size / 2)
-        the_file.seek(mod_pos, SEEK_SET)
-        b = the_file.read(1)
-        the_file.seek(mod_pos, SEEK_SET)
-        the_file.write(bytes([b[0] + 1]))
+        with mmap.mmap(the_file.fileno(), 0) as mm:
+            mod_pos = len(mm) // 2
+            mm[mod_pos] = (mm[mod_pos] + 1) & 0xFF
     os.utime(
         path=sle.file_path,
-        times=(
-            sr.st_atime,
-            sr.st_mtime,
+        ns=(
+            sr.st_atime_ns,
+            sr.st_mtime_ns,
         ),
     )
     sle.state = STATE_BITROT
@@ -1121,9 +1186,14 @@ def perform_validate_arrange_basic(
         dst_dir=current_template_root,
     )
 
+    # The template and target source are only ever changed by adding, removing,
+    # or renaming files, never by rewriting one, so they can share inodes. The
+    # target source "orig" copy below is the independent baseline the undo
+    # check compares against, so it is a real copy.
     duplicate_tree(
         src_dir=current_template_root,
         dst_dir=outdated_target_source_root,
+        hardlink=True,
     )
 
     duplicate_tree(
@@ -1134,92 +1204,77 @@ def perform_validate_arrange_basic(
     with DirInfo(dir_path=current_template_root) as template_di:
         template_di.gather_info()
 
-        removed_or_moved_old_rel_paths = set()
-        removed_or_moved_new_rel_paths = set()
-
         # Delete a file.
         files_deleted, files_remaining = template_di.delete_randomly_chosen_files(
             num_to_delete=1,
         )
-        deleted_file_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=files_deleted[0],
-            )
+        deleted_file_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=files_deleted[0],
         )
-        removed_or_moved_old_rel_paths.add(deleted_file_rel_path)
 
-        idx_available_for_tests = [*range(0, len(template_di.file_list))]
-        random.shuffle(idx_available_for_tests)
+        # Three distinct files to move, rename, and move+rename.
+        idx_to_move, idx_to_rename, idx_to_move_rename = random.sample(
+            range(len(template_di.file_list)), 3
+        )
 
         # Move a file to a newly created directory.
-        idx_to_move = idx_available_for_tests.pop()
         move_src_path = template_di.file_list[idx_to_move].path
-        move_src_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=move_src_path,
-            )
+        move_src_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=move_src_path,
         )
-        removed_or_moved_old_rel_paths.add(move_src_rel_path)
         basename_to_move = os.path.basename(move_src_path)
         dest_dir = os.path.join(current_template_root, "NewDir")
         move_dest_path = os.path.join(dest_dir, basename_to_move)
-        move_dest_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=move_dest_path,
-            )
-        )
-        removed_or_moved_new_rel_paths.add(move_dest_rel_path)
-        os.renames(
-            old=move_src_path,
-            new=move_dest_path,
+        move_dest_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=move_dest_path,
         )
+        move_file(src_path=move_src_path, dest_path=move_dest_path)
 
         # Rename an existing file, keeping in the same directory.
-        idx_to_rename = idx_available_for_tests.pop()
         rename_src_path = template_di.file_list[idx_to_rename].path
-        rename_src_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=rename_src_path,
-            )
+        rename_src_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=rename_src_path,
         )
-        removed_or_moved_old_rel_paths.add(rename_src_rel_path)
         base, ext = os.path.splitext(os.path.basename(rename_src_path))
         new_basename_of_rename = f"Rename-{base}-Rename{ext}"
         rename_dest_path = os.path.join(os.path.dirname(rename_src_path), new_basename_of_rename)
-        rename_dest_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=rename_dest_path,
-            )
-        )
-        removed_or_moved_new_rel_paths.add(rename_dest_rel_path)
-        os.renames(
-            old=rename_src_path,
-            new=rename_dest_path,
+        rename_dest_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=rename_dest_path,
         )
+        move_file(src_path=rename_src_path, dest_path=rename_dest_path)
 
         # Rename an existing file, moving it to another directory.
-        idx_to_move_rename = idx_available_for_tests.pop()
         move_rename_src_path = template_di.file_list[idx_to_move_rename].path
-        move_rename_src_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=move_rename_src_path,
-            )
+        move_rename_src_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=move_rename_src_path,
         )
-        removed_or_moved_old_rel_paths.add(move_rename_src_rel_path)
         base, ext = os.path.splitext(os.path.basename(move_rename_src_path))
         new_basename_of_move_rename = f"Rename-{base}-Rename{ext}"
         move_rename_dest_dir = os.path.join(current_template_root, "NewDirRenamedFile")
         move_rename_dest_path = os.path.join(move_rename_dest_dir, new_basename_of_move_rename)
-        move_rename_dest_rel_path = os.path.normcase(get_rel_path(
-                root_path=current_template_root,
-                path_within_root=move_rename_dest_path,
-            )
-        )
-        removed_or_moved_new_rel_paths.add(move_rename_dest_rel_path)
-        os.renames(
-            old=move_rename_src_path,
-            new=move_rename_dest_path,
+        move_rename_dest_rel_path = get_rel_path_nc(
+            root_path=current_template_root,
+            path_within_root=move_rename_dest_path,
         )
+        move_file(src_path=move_rename_src_path, dest_path=move_rename_dest_path)
+
+        removed_or_moved_old_rel_paths = frozenset((
+            deleted_file_rel_path,
+            move_src_rel_path,
+            rename_src_rel_path,
+            move_rename_src_rel_path,
+        ))
+        removed_or_moved_new_rel_paths = frozenset((
+            move_dest_rel_path,
+            rename_dest_rel_path,
+            move_rename_dest_rel_path,
+        ))
 
     add_files_size_defs = [
         StaticTestValues(values=list(range(1000,1020)), some_limit=2),
@@ -1256,11 +1311,21 @@ def perform_validate_arrange_basic(
     )
     assert rr.ret == ExitCode.OK
 
+    # One process pool for all four directories' digests.
     with (
-        DirInfo(dir_path=original_test_data_directory) as original_di,
-        DirInfo(dir_path=current_template_root) as template_di,
-        DirInfo(dir_path=outdated_target_source_root) as target_source_di,
-        DirInfo(dir_path=arranged_target_dest_root) as target_dest_di,
+        ProcessPoolExecutor() as process_exec,
+        DirInfo(
+            dir_path=original_test_data_directory, process_exec=process_exec
+        ) as original_di,
+        DirInfo(
+            dir_path=current_template_root, process_exec=process_exec
+        ) as template_di,
+        DirInfo(
+            dir_path=outdated_target_source_root, process_exec=process_exec
+        ) as target_source_di,
+        DirInfo(
+            dir_path=arranged_target_dest_root, process_exec=process_exec
+        ) as target_dest_di,
     ):
         original_di.gather_info(start_gathering_digests=True)
         template_di.gather_info()
@@ -1327,7 +1392,9 @@ def perform_validate_arrange_basic(
         dest_files_added_count = len(files_added)*2 if is_per_file else len(files_added) + 1
         template_less_target_dest = template_set.difference(target_dest_set)
         assert len(template_less_target_dest) == dest_files_added_count
-        files_added_nc_rel_path_set = set([get_rel_path_nc(current_template_root, fa) for fa in files_added])
+        files_added_nc_rel_path_set = {
+            get_rel_path_nc(current_template_root, fa) for fa in files_added
+        }
         assert files_added_nc_rel_path_set.issubset(template_less_target_dest)
 
 
@@ -1338,26 +1405,36 @@ def perform_validate_arrange_basic(
             assert f"{deleted_file_rel_path}{ATBU_PERSISTENT_INFO_EXTENSION}" in target_source_less_target_dest
 
         original_rp_fi_dict = original_di.get_nc_rel_path_dict()
+        # Files moved/renamed in the template are found in the original by their
+        # old path.
+        moved_dest_to_src_rel_path = {
+            move_dest_rel_path: move_src_rel_path,
+            rename_dest_rel_path: rename_src_rel_path,
+            move_rename_dest_rel_path: move_rename_src_rel_path,
+        }
+        matched_dest_fis = []
         for dest_rp, dest_fi in target_dest_di.get_nc_rel_path_dict().items():
             orig_fi = original_rp_fi_dict.get(dest_rp)
-            if orig_fi is None:
-                if dest_rp == move_dest_rel_path:
-                    orig_fi = original_rp_fi_dict.get(move_src_rel_path)
-                elif dest_rp == rename_dest_rel_path:
-                    orig_fi = original_rp_fi_dict.get(rename_src_rel_path)
-                elif dest_rp == move_rename_dest_rel_path:
-                    orig_fi = original_rp_fi_dict.get(move_rename_src_rel_path)
+            if orig_fi is None and dest_rp in moved_dest_to_src_rel_path:
+                orig_fi = original_rp_fi_dict.get(moved_dest_to_src_rel_path[dest_rp])
             if orig_fi is not None:
                 assert dest_fi == orig_fi
-                if is_per_file:
-                    fip = FileInformationPersistent(path=dest_fi.path)
-                    assert fip.info_data_file_exists()
-                    fip.read_info_data_file()
-                    assert dest_fi.digest == fip.primary_digest
+                matched_dest_fis.append(dest_fi)
             elif os.path.splitext(dest_rp)[1] == ATBU_PERSISTENT_INFO_EXTENSION:
                 continue
             else:
                 fail(f"Expected to validate all target destination files: {dest_rp}")
+        if is_per_file:
+            # Read the destination .atbu files concurrently.
+            with ThreadPoolExecutor() as executor:
+                persisted_digests = executor.map(
+                    read_persisted_primary_digest,
+                    [dest_fi.path for dest_fi in matched_dest_fis],
+                )
+                for dest_fi, persisted_digest in zip(
+                    matched_dest_fis, persisted_digests
+                ):
+                    assert dest_fi.digest == persisted_digest
         pass  # pylint: disable=unnecessary-pass
 
 
@@ -1453,26 +1530,23 @@ def test_arrange_undo(
     assert rr.ret == ExitCode.OK
 
     with (
-        DirInfo(dir_path=outdated_target_source_root_orig) as target_source_orig,
-        DirInfo(dir_path=outdated_target_source_root) as target_source_undo,
+        ProcessPoolExecutor() as process_exec,
+        DirInfo(
+            dir_path=outdated_target_source_root_orig, process_exec=process_exec
+        ) as target_source_orig,
+        DirInfo(
+            dir_path=outdated_target_source_root, process_exec=process_exec
+        ) as target_source_undo,
     ):
         # For this test, .atbu and atbudb files are generated as part of the arrange command
         # so are not part of the original target source content.
-        re_pat_exclude_atbu = re.compile(
-            pattern=(
-                rf".*("
-                rf"{re.escape(ATBU_PERSISTENT_INFO_EXTENSION)}|"
-                rf"{re.escape(ATBU_PERSISTENT_INFO_DB_EXTENSION)})$"
-            ),
-            flags=0 if is_platform_path_case_sensitive() else re.IGNORECASE
-        )
         target_source_orig.gather_info(
             start_gathering_digests=True,
-            re_pattern_exclude=re_pat_exclude_atbu,
+            re_pattern_exclude=RE_PAT_EXCLUDE_ATBU,
         )
         target_source_undo.gather_info(
             start_gathering_digests=True,
-            re_pattern_exclude=re_pat_exclude_atbu,
+            re_pattern_exclude=RE_PAT_EXCLUDE_ATBU,
         )
         assert len(target_source_orig.file_list) == len(target_source_undo.file_list)
         assert directories_match_entirely_by_order(
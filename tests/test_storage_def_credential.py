@@ -18,6 +18,7 @@
 # pylint: disable=wrong-import-position
 
 import base64
+from hashlib import pbkdf2_hmac
 import os
 from pathlib import Path
 import logging
@@ -46,6 +47,7 @@ from atbu.tools.backup.constants import (
     CRED_SECRET_KIND_STORAGE,
 )
 
+from atbu.tools.backup import credentials
 from atbu.tools.backup.credentials import (
     CredentialByteArray,
     Credential,
@@ -64,6 +66,15 @@ ATBU_TEST_BACKUP_NAME = "AtbuTestBackup-5b497bb3-c9ef-48a9-af7b-2327fc17fb65"
 
 SIMPLE_SECRET = "secret-1234567890!"
 SIMPLE_PASSWORD = "1234567890abcdefghij$"
+STORAGE_SECRET = "test-storage-secret"
+# STORAGE_SECRET as stored in a storage definition's configuration.
+STORAGE_SECRET_CONFIG_VALUE = base64.b64encode(
+    f"K={STORAGE_SECRET.encode('utf-8').hex()}".encode("utf-8")
+).decode("utf-8")
+# Storage definition section paths of each secret, i.e., ["encryption", "key"].
+# Read-only, shared by all tests.
+CRED_SECRET_KIND_ENCRYPTION_PARTS = CRED_SECRET_KIND_ENCRYPTION.split("-")
+CRED_SECRET_KIND_STORAGE_PARTS = CRED_SECRET_KIND_STORAGE.split("-")
 
 
 def setup_module(module):  # pylint: disable=unused-argument
@@ -74,6 +85,32 @@ def teardown_module(module):  # pylint: disable=unused-argument
     pass
 
 
+@pytest.fixture(autouse=True)
+def cache_pbkdf2_hmac(monkeypatch: pytest.MonkeyPatch):
+    """Each protect/unprotect round trip derives the same key encryption key
+    from the same password and salt at the full PBKDF2 work factor. Memoize
+    the derivation for the duration of each test so repeated derivations are
+    computed once.
+    """
+    cache: dict[tuple, bytes] = {}
+
+    def cached_pbkdf2_hmac(hash_name, password, salt, iterations, dklen=None):
+        key = (hash_name, bytes(password), bytes(salt), iterations, dklen)
+        result = cache.get(key)
+        if result is None:
+            result = pbkdf2_hmac(
+                hash_name=hash_name,
+                password=password,
+                salt=salt,
+                iterations=iterations,
+                dklen=dklen,
+            )
+            cache[key] = result
+        return result
+
+    monkeypatch.setattr(credentials, "pbkdf2_hmac", cached_pbkdf2_hmac)
+
+
 def add_encryption_credential_to_set(
     storage_def_name: str,
     cred_set: StorageDefCredentialSet,
@@ -89,7 +126,7 @@ def add_encryption_credential_to_set(
     )
     cred_set.append(
         desc_cred=desc_cred_encryption,
-        affected_config_path_parts=CRED_SECRET_KIND_ENCRYPTION.split("-"),
+        affected_config_path_parts=CRED_SECRET_KIND_ENCRYPTION_PARTS,
     )
     if credential_password is not None:
         cred_set.get_encryption_desc_cred().credential.set(
@@ -119,7 +156,7 @@ def add_storage_credential_to_set(
     )
     cred_set.append(
         desc_cred=desc_cred_storage,
-        affected_config_path_parts=CRED_SECRET_KIND_STORAGE.split("-"),
+        affected_config_path_parts=CRED_SECRET_KIND_STORAGE_PARTS,
     )
     if credential_password is not None:
         cred_set.get_storage_desc_cred().credential.set(
@@ -210,7 +247,15 @@ def test_storage_def_credential_set(
     This scenario initializes the StorageDefCredentialSet by building the credentials
     manually in code, and not deriving some/all from the configuration file.
     """
-    storage_def_name = "test_storage_def_credential_set"
+    # Keyring entries are keyed by storage definition name and, with an OS
+    # keyring, shared by all processes. A name unique to each case lets the
+    # cases run concurrently (i.e., pytest-xdist) without colliding.
+    storage_def_name = (
+        f"test_storage_def_credential_set"
+        f"-{int(is_storage_secret_in_config)}"
+        f"{int(is_populate_init)}"
+        f"{int(is_password_protected)}"
+    )
     atbu_cfg, _, _ = AtbuConfig.access_cloud_storage_config(
         storage_def_name=storage_def_name,
         must_exist=False,
@@ -224,7 +269,7 @@ def test_storage_def_credential_set(
     if is_password_protected:
         credential_password = CredentialByteArray("test-cred-pwd$".encode("utf-8"))
 
-    storage_secret = "test-storage-secret"
+    storage_secret = STORAGE_SECRET
     if not is_storage_secret_in_config:
         other_kv_pairs = {
             CONFIG_VALUE_NAME_DRIVER_STORAGE_KEY: "test-storage-key",
@@ -232,9 +277,7 @@ def test_storage_def_credential_set(
     else:
         other_kv_pairs = {
             CONFIG_VALUE_NAME_DRIVER_STORAGE_KEY: "test-storage-key",
-            CONFIG_VALUE_NAME_DRIVER_STORAGE_SECRET: base64.b64encode(
-                f"K={storage_secret.encode('utf-8').hex()}".encode("utf-8")
-            ).decode("utf-8"),
+            CONFIG_VALUE_NAME_DRIVER_STORAGE_SECRET: STORAGE_SECRET_CONFIG_VALUE,
             CONFIG_PASSWORD_TYPE: "actual",
         }
 
@@ -299,10 +342,10 @@ def test_storage_def_credential_set(
     )
 
     encryption_dict, encryption_key_value_name = cred_set.get_affected_section(
-        CRED_SECRET_KIND_ENCRYPTION.split("-")
+        CRED_SECRET_KIND_ENCRYPTION_PARTS
     )
     storage_dict, storage_secret_value_name = cred_set.get_affected_section(
-        CRED_SECRET_KIND_STORAGE.split("-")
+        CRED_SECRET_KIND_STORAGE_PARTS
     )
 
     assert (
@@ -0,0 +1,184 @@
+# Copyright 2022 Ashley R. Thomas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=unused-argument
+# pylint: disable=missing-function-docstring
+
+from types import SimpleNamespace
+
+from azure.core.exceptions import HttpResponseError
+import pytest
+from pytest import raises
+
+from atbu.common.exception import ObjectDoesNotExistError
+from atbu.tools.backup.storage_interface.azure import (
+    AZURE_MAX_BLOBS_PER_BATCH,
+    AzureStorageContainerInterface,
+)
+from atbu.tools.backup.storage_interface.base import StorageContainerInterface
+
+# The Google SDK is imported inside the google_storage tests, so collecting
+# this module does not load it (see conftest.py pytest_collection_modifyitems).
+
+
+class _LoopOnlyContainer(StorageContainerInterface):
+    """Relies on the base class delete_objects."""
+
+    def __init__(self):
+        super().__init__()
+        self.deleted = []
+
+    @property
+    def name(self) -> str:
+        return "loop-only"
+
+    def get_object(self, object_name: str):
+        raise NotImplementedError()
+
+    def delete_object(self, object_name: str):
+        self.deleted.append(object_name)
+
+    def list_objects(self, prefix: str = None):
+        return []
+
+
+class _FakeAzureContainerClient:
+    def __init__(self, existing: set[str], fail_status: dict[str, int] = None):
+        self.existing = existing
+        self.fail_status = fail_status or {}
+        self.batches = []
+
+    def delete_blobs(self, *blobs, raise_on_any_failure=True):
+        assert not raise_on_any_failure
+        self.batches.append(list(blobs))
+        responses = []
+        for b in blobs:
+            if b in self.fail_status:
+                status_code = self.fail_status[b]
+            elif b in self.existing:
+                self.existing.remove(b)
+                status_code = 202
+            else:
+                status_code = 404
+            responses.append(
+                SimpleNamespace(
+                    status_code=status_code,
+                    reason="",
+                    headers={},
+                    text=lambda encoding=None: "",
+                )
+            )
+        return iter(responses)
+
+
+class _FakeGoogleBatch:
+    def __init__(self, bucket: "_FakeGoogleBucket"):
+        self.bucket = bucket
+
+    def __enter__(self):
+        self.bucket.batches.append([])
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Like google.cloud.storage.Batch, report failures when the batch is sent.
+        if exc_type is None:
+            missing = [n for n in self.bucket.batches[-1] if n not in self.bucket.existing]
+            self.bucket.existing.difference_update(self.bucket.batches[-1])
+            if missing:
+                raise self.bucket.not_found_exc_cls(f"No such object: {missing[0]}")
+
+
+class _FakeGoogleBucket:
+    def __init__(self, existing: set[str], not_found_exc_cls: type = None):
+        self.existing = existing
+        self.not_found_exc_cls = not_found_exc_cls
+        self.batches = []
+        self.client = SimpleNamespace(batch=lambda: _FakeGoogleBatch(self))
+
+    def delete_blob(self, blob_name):
+        self.batches[-1].append(blob_name)
+
+
+def _names(count: int) -> list[str]:
+    return [f"object-{i:04}" for i in range(count)]
+
+
+def test_delete_objects_base_loop():
+    c = _LoopOnlyContainer()
+    names = _names(5)
+    c.delete_objects(names)
+    assert c.deleted == names
+
+
+def test_delete_objects_azure_batches():
+    names = _names(AZURE_MAX_BLOBS_PER_BATCH * 2 + 1)
+    client = _FakeAzureContainerClient(existing=set(names))
+    AzureStorageContainerInterface(container=client).delete_objects(names)
+    assert [len(b) for b in client.batches] == [
+        AZURE_MAX_BLOBS_PER_BATCH,
+        AZURE_MAX_BLOBS_PER_BATCH,
+        1,
+    ]
+    assert sum(client.batches, []) == names
+    assert not client.existing
+
+
+def test_delete_objects_azure_ignores_missing():
+    names = _names(3)
+    client = _FakeAzureContainerClient(existing=set(names[1:]))
+    AzureStorageContainerInterface(container=client).delete_objects(names)
+    assert not client.existing
+
+
+def test_delete_objects_azure_raises_other_failures():
+    names = _names(3)
+    client = _FakeAzureContainerClient(
+        existing=set(names), fail_status={names[1]: 403}
+    )
+    with raises(HttpResponseError):
+        AzureStorageContainerInterface(container=client).delete_objects(names)
+
+
+@pytest.mark.google_storage
+def test_delete_objects_google_batches():
+    # pylint: disable=import-outside-toplevel
+    from atbu.tools.backup.storage_interface.google import (
+        GOOGLE_MAX_CALLS_PER_BATCH,
+        GoogleStorageContainerInterface,
+    )
+
+    names = _names(GOOGLE_MAX_CALLS_PER_BATCH * 2 + 1)
+    bucket = _FakeGoogleBucket(existing=set(names))
+    GoogleStorageContainerInterface(container=bucket).delete_objects(names)
+    assert [len(b) for b in bucket.batches] == [
+        GOOGLE_MAX_CALLS_PER_BATCH,
+        GOOGLE_MAX_CALLS_PER_BATCH,
+        1,
+    ]
+    assert sum(bucket.batches, []) == names
+    assert not bucket.existing
+
+
+@pytest.mark.google_storage
+def test_delete_objects_google_missing_raises_does_not_exist():
+    # pylint: disable=import-outside-toplevel
+    from google.api_core.exceptions import NotFound
+    from atbu.tools.backup.storage_interface.google import (
+        GoogleStorageContainerInterface,
+    )
+
+    names = _names(3)
+    bucket = _FakeGoogleBucket(existing=set(names[1:]), not_found_exc_cls=NotFound)
+    with raises(ObjectDoesNotExistError):
+        GoogleStorageContainerInterface(container=bucket).delete_objects(names)